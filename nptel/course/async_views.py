@@ -0,0 +1,125 @@
+"""
+Async versions of the read-only course endpoints, served by the ASGI
+deployment (see nptel/asgi_urls.py).
+
+They are plain Django async views using the async ORM and cache APIs, so a
+request never occupies a thread while waiting for the database. Responses
+have the same layout as their DRF counterparts in course/views.py. Other
+HTTP methods, and GET requests an async view does not handle (such as a
+custom catalog `ordering`), are passed on to the sync DRF view.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from user.authentication import aauthenticate
+from user.permissions import aget_profile_id
+from .filters import CourseCatalogFilter, RegistrationStatusFilter, facet_rows, summarise_facets
+from .models import Course, Registration
+from .pagination import AsyncKeysetPagination
+from .serializers import CourseDetailSerializer, CourseDetailValuesSerializer, RegistrationValuesSerializer
+from . import cache, views
+
+
+def render(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def exception_response(exc):
+    """Turn a DRF exception or Http404 into the response DRF would send."""
+    response = exception_handler(exc, {})
+    rendered = render(response.data, status=response.status_code)
+    for name, value in response.items():
+        rendered[name] = value
+    if response.status_code == 401:
+        rendered['WWW-Authenticate'] = 'Bearer realm="api"'
+    return rendered
+
+
+def async_read_view(sync_view):
+    """
+    Serve GET requests with the decorated coroutine and everything else with
+    `sync_view`. The coroutine may return None to pass a GET on as well.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method == 'GET':
+                try:
+                    response = await handler(request, *args, **kwargs)
+                except (exceptions.APIException, Http404) as exc:
+                    response = exception_response(exc)
+                if response is not None:
+                    return response
+            return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+        # Like every DRF view; the sync view does its own authentication.
+        view.csrf_exempt = True
+        return view
+    return decorator
+
+
+async def faculty_profile_id(request):
+    """Profile id of the authenticated faculty, with the errors of IsFaculty."""
+    authenticated = await aauthenticate(request)
+    if authenticated is None:
+        raise exceptions.NotAuthenticated()
+    profile_id = await aget_profile_id(*authenticated, 'faculty')
+    if profile_id is None:
+        raise exceptions.PermissionDenied()
+    return profile_id
+
+
+# Views
+@async_read_view(views.CourseListAPIView.as_view())
+async def course_list(request):
+    if 'ordering' in request.GET:
+        return None
+
+    async def build():
+        courses = CourseCatalogFilter().filter_queryset(Request(request), Course.objects.all(), None)
+        page, meta = await AsyncKeysetPagination(('-created_at', '-id')).paginate(
+            request, CourseDetailValuesSerializer.values(courses)
+        )
+        data = {**meta, 'results': CourseDetailValuesSerializer(page).data}
+        if request.GET.get('facets', '').lower() in ('1', 'true'):
+            data['facets'] = summarise_facets([row async for row in facet_rows(courses)])
+        return data
+
+    return render(await cache.acatalog_page(request, build))
+
+
+@async_read_view(views.CourseDetailAPIView.as_view())
+async def course_detail(request, course_code):
+    profile_id = await faculty_profile_id(request)
+
+    async def build():
+        course = await aget_object_or_404(Course.objects.select_related('instructor'), course_code=course_code)
+        return CourseDetailSerializer(course).data
+
+    payload = await cache.acourse_payload(course_code, build)
+    if payload['instructor'] != profile_id:
+        raise Http404
+    return render(payload)
+
+
+@async_read_view(views.CourseRegistrationListAPIView.as_view())
+async def course_registrations(request, course_code):
+    profile_id = await faculty_profile_id(request)
+    course = await aget_object_or_404(Course.objects.only('id'), course_code=course_code, instructor_id=profile_id)
+
+    registrations = RegistrationStatusFilter().filter_queryset(
+        Request(request),
+        Registration.objects.filter(course=course),
+        None,
+    )
+    page, meta = await AsyncKeysetPagination(('-registration_date', '-id')).paginate(
+        request, RegistrationValuesSerializer.values(registrations)
+    )
+    return render({**meta, 'results': RegistrationValuesSerializer(page).data})
@@ -0,0 +1,245 @@
+"""
+Versioned cache for the public course catalog.
+
+Every entry is keyed by the current catalog version. Changing a course bumps
+the version (see course/signals.py), which makes all older entries
+unreachable at once; they simply expire from the backend afterwards.
+
+Entries that depend on registrations are also keyed by the version of a
+scope, `course:<course_code>` or `faculty:<faculty profile id>`. A
+registration change only bumps the scopes of its course, so it leaves the
+rest of the catalog cached. Catalog pages are not scoped: the registration
+counters they show may lag by up to COURSE_CACHE_TIMEOUT.
+
+Functions prefixed with `a` are the counterparts for async views and take
+an async `build` callable.
+"""
+import asyncio
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from nptel.routers import reading_from_replica
+
+
+VERSION_KEY = 'course:catalog:version'
+HITS_KEY = 'course:catalog:hits'
+MISSES_KEY = 'course:catalog:misses'
+
+# How long a single rebuild may hold the lock, and how often waiting
+# requests poll for the rebuilt value.
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _new_version():
+    # Never hand out a version that may still have entries in the cache.
+    return time.time_ns()
+
+
+def get_catalog_version():
+    """Return the current catalog version, initialising it if needed."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog page and course payload."""
+    _bump(VERSION_KEY)
+
+
+def _scope_key(scope):
+    return f"{VERSION_KEY}:{scope}"
+
+
+def course_scopes(course):
+    """The scopes of the entries that depend on the registrations of `course`."""
+    return (f"course:{course.course_code}", f"faculty:{course.instructor_id}")
+
+
+def bump_scope_versions(*scopes):
+    """Invalidate the cached entries of the given scopes only."""
+    for scope in scopes:
+        _bump(_scope_key(scope))
+
+
+def _get_versions(scopes):
+    keys = [VERSION_KEY, *(_scope_key(scope) for scope in scopes)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if versions.get(key) is None:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def _increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_stats():
+    """Return the hit/miss counters and the current catalog version."""
+    return {
+        'version': get_catalog_version(),
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def _versioned_key(namespace, version, parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f"course:{namespace}:{version}:{digest}"
+
+
+def make_key(namespace, *parts, scopes=()):
+    """Build a cache key for the current catalog version and versions of `scopes`."""
+    if scopes:
+        return _versioned_key(namespace, _get_versions(scopes), parts)
+    return _versioned_key(namespace, get_catalog_version(), parts)
+
+
+async def aget_catalog_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _new_version(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+async def _aget_versions(scopes):
+    keys = [VERSION_KEY, *(_scope_key(scope) for scope in scopes)]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if versions.get(key) is None:
+            await cache.aadd(key, _new_version(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+async def amake_key(namespace, *parts, scopes=()):
+    if scopes:
+        return _versioned_key(namespace, await _aget_versions(scopes), parts)
+    return _versioned_key(namespace, await aget_catalog_version(), parts)
+
+
+def get_or_build(key, build, timeout=None):
+    """
+    Return the cached value for `key`, building it with `build()` on a miss.
+
+    Only one caller rebuilds a missing entry; concurrent callers wait for
+    that value instead of all querying the database at the same time.
+    """
+    if timeout is None:
+        timeout = settings.COURSE_CACHE_TIMEOUT
+    if reading_from_replica():
+        # A lagging replica may miss the change that bumped the version.
+        timeout = min(timeout, settings.DB_REPLICA_PIN_SECONDS)
+
+    value = cache.get(key)
+    if value is not None:
+        _increment(HITS_KEY)
+        return value
+
+    _increment(MISSES_KEY)
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = build()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    # The rebuilding request died or timed out, do the work ourselves.
+    return build()
+
+
+def catalog_page(request, build):
+    """Return a cached catalog page for this exact URL."""
+    return get_or_build(make_key('catalog', request.build_absolute_uri()), build)
+
+
+def course_payload(course_code, build):
+    """Return the cached serialized payload of a single course."""
+    return get_or_build(make_key('detail', course_code, scopes=[f"course:{course_code}"]), build)
+
+
+async def _aincrement(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+async def aget_or_build(key, build, timeout=None):
+    """Async version of `get_or_build`, `build` is awaited."""
+    if timeout is None:
+        timeout = settings.COURSE_CACHE_TIMEOUT
+    if reading_from_replica():
+        # A lagging replica may miss the change that bumped the version.
+        timeout = min(timeout, settings.DB_REPLICA_PIN_SECONDS)
+
+    value = await cache.aget(key)
+    if value is not None:
+        await _aincrement(HITS_KEY)
+        return value
+
+    await _aincrement(MISSES_KEY)
+    lock_key = f"{key}:lock"
+    if await cache.aadd(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = await build()
+            await cache.aset(key, value, timeout)
+        finally:
+            await cache.adelete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+
+    return await build()
+
+
+async def acatalog_page(request, build):
+    """
+    Cached catalog page of the async views. Kept apart from `catalog_page`
+    because the pagination cursors in the two differ.
+    """
+    return await aget_or_build(await amake_key('acatalog', request.build_absolute_uri()), build)
+
+
+async def acourse_payload(course_code, build):
+    """Shares its entries with `course_payload`, the payload is the same."""
+    return await aget_or_build(await amake_key('detail', course_code, scopes=[f"course:{course_code}"]), build)
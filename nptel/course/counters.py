@@ -0,0 +1,88 @@
+"""
+Denormalized registration counters.
+
+Course keeps the number of pending, approved and completed registrations and
+StudentProfile the number of approved ones. Counters are moved with F()
+updates in the same transaction as the registration change, see the
+Registration receivers in course/signals.py.
+"""
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from user.models import StudentProfile
+from .models import Course, Registration
+
+
+COURSE_COUNTED_STATUSES = ('pending', 'approved', 'completed')
+STUDENT_COUNTED_STATUSES = ('approved',)
+
+
+def move_counters(course_id, student_id, old_status, new_status):
+    """
+    Move one registration from `old_status` to `new_status`. Use None as
+    `old_status` for a new registration and as `new_status` for a deleted one,
+    and as `course_id` to leave the course counters alone.
+    """
+    if old_status == new_status:
+        return
+
+    course_changes = {}
+    student_delta = 0
+    if old_status in COURSE_COUNTED_STATUSES:
+        course_changes[f'{old_status}_count'] = F(f'{old_status}_count') - 1
+    if new_status in COURSE_COUNTED_STATUSES:
+        course_changes[f'{new_status}_count'] = F(f'{new_status}_count') + 1
+    if old_status in STUDENT_COUNTED_STATUSES:
+        student_delta -= 1
+    if new_status in STUDENT_COUNTED_STATUSES:
+        student_delta += 1
+
+    if course_changes and course_id is not None:
+        Course.objects.filter(pk=course_id).update(**course_changes)
+    if student_delta:
+        StudentProfile.objects.filter(pk=student_id).update(approved_count=F('approved_count') + student_delta)
+
+
+def add_pending(registrations):
+    """Count a batch of new pending registrations, e.g. after a bulk_create."""
+    per_course = {}
+    for registration in registrations:
+        per_course[registration.course_id] = per_course.get(registration.course_id, 0) + 1
+    if not per_course:
+        return
+    increment = Case(
+        *[When(pk=course_id, then=Value(count)) for course_id, count in per_course.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Course.objects.filter(pk__in=per_course).update(pending_count=F('pending_count') + increment)
+
+
+def _count(status, outer_field):
+    registrations = (
+        Registration.objects.filter(**{outer_field: OuterRef('pk')}, status=status)
+        .order_by().values(outer_field).annotate(n=Count('id')).values('n')
+    )
+    return Coalesce(Subquery(registrations, output_field=IntegerField()), 0)
+
+
+def expected_course_counters():
+    return Course.objects.annotate(**{
+        f'expected_{status}': _count(status, 'course') for status in COURSE_COUNTED_STATUSES
+    })
+
+
+def expected_student_counters():
+    return StudentProfile.objects.annotate(**{
+        f'expected_{status}': _count(status, 'student') for status in STUDENT_COUNTED_STATUSES
+    })
+
+
+def rebuild_counters():
+    """Recompute every counter from the registration table."""
+    Course.objects.update(**{
+        f'{status}_count': _count(status, 'course') for status in COURSE_COUNTED_STATUSES
+    })
+    StudentProfile.objects.update(**{
+        f'{status}_count': _count(status, 'student') for status in STUDENT_COUNTED_STATUSES
+    })
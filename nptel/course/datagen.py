@@ -0,0 +1,271 @@
+"""
+Synthetic data for load testing.
+
+`DataGenerator` creates faculty, courses, students and registrations with
+explicit primary keys, so rows can reference each other without reading
+anything back. Every table is written in chunks: with PostgreSQL and
+psycopg 3 each chunk is one `COPY ... FROM STDIN`, other databases get one
+`executemany` INSERT per chunk. Model signals and auto_now are bypassed;
+student, faculty and course IDs come from `user.identifiers`, and the
+registration counters are rebuilt at the end.
+
+The data only depends on the seed and the requested volumes: the same
+arguments on an empty database produce the same rows. Every student
+registers for distinct courses, popular courses get more registrations,
+and no student has more than Registration.MAX_APPROVED_COURSES approved
+ones.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+
+from user.identifiers import new_identifiers
+from user.models import User, FacultyProfile, StudentProfile
+from .cache import bump_catalog_version
+from .counters import rebuild_counters
+from .models import Course, Registration
+
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Divya', 'Farhan', 'Gauri', 'Ishaan', 'Kavya',
+    'Lakshmi', 'Manoj', 'Meera', 'Nikhil', 'Pooja', 'Rahul', 'Riya', 'Sanjay', 'Sneha', 'Vikram',
+]
+LAST_NAMES = [
+    'Bose', 'Chatterjee', 'Das', 'Gupta', 'Iyer', 'Joshi', 'Kapoor', 'Kumar', 'Menon', 'Mishra',
+    'Nair', 'Patel', 'Pillai', 'Rao', 'Reddy', 'Shah', 'Sharma', 'Singh', 'Thomas', 'Verma',
+]
+DEPARTMENTS = [
+    'Computer Science', 'Electrical Engineering', 'Mechanical Engineering', 'Civil Engineering',
+    'Mathematics', 'Physics', 'Chemistry', 'Biotechnology', 'Humanities', 'Management',
+]
+DESIGNATIONS = ['Professor', 'Associate Professor', 'Assistant Professor', 'Lecturer']
+COURSE_LEVELS = ['Introduction to', 'Foundations of', 'Applied', 'Advanced', 'Topics in']
+COURSE_SUBJECTS = [
+    'Algorithms', 'Data Structures', 'Machine Learning', 'Operating Systems', 'Databases',
+    'Signal Processing', 'Thermodynamics', 'Fluid Mechanics', 'Linear Algebra', 'Probability',
+    'Quantum Mechanics', 'Organic Chemistry', 'Genetics', 'Economics', 'Technical Writing',
+]
+STATUSES = ['pending', 'approved', 'rejected', 'completed']
+STATUS_WEIGHTS = [50, 20, 10, 20]
+GRADES = ['S', 'A', 'B', 'C', 'D', 'E']
+
+
+def chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+class DataGenerator:
+    """Generate referentially consistent data in one transaction."""
+
+    def __init__(self, faculty, courses, students, registrations, seed=0, password='Password-123',
+                 start=datetime(2025, 1, 1, tzinfo=timezone.utc), days=365, batch_size=10000, progress=None):
+        if not faculty and courses:
+            raise ValueError('Courses need at least one faculty.')
+        if registrations and not (students and courses):
+            raise ValueError('Registrations need students and courses.')
+        if registrations > students * courses:
+            raise ValueError('There are not enough (student, course) pairs for the registrations.')
+        self.faculty = faculty
+        self.courses = courses
+        self.students = students
+        self.registrations = registrations
+        self.seed = seed
+        self.password = password
+        self.start = start
+        self.seconds = days * 86400
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+        self.connection = connections[DEFAULT_DB_ALIAS]
+        self.use_copy = self.connection.vendor == 'postgresql' and _is_psycopg3()
+
+    def rng(self, name):
+        # A separate stream per table, so changing one volume leaves the
+        # rows of the other tables as they were.
+        return random.Random(f'{self.seed}:{name}')
+
+    def timestamp(self, rng):
+        return self.start + timedelta(seconds=rng.randrange(self.seconds))
+
+    def run(self):
+        """Generate everything and return the number of rows per table."""
+        self.password_hash = make_password(self.password)
+        with transaction.atomic():
+            self.user_start = self.next_id(User)
+            self.faculty_start = self.next_id(FacultyProfile)
+            self.course_start = self.next_id(Course)
+            self.student_start = self.next_id(StudentProfile)
+            self.registration_start = self.next_id(Registration)
+
+            counts = {
+                'users': self.write(User, self.USER_FIELDS, self.user_rows()),
+                'faculty': self.write(FacultyProfile, self.FACULTY_FIELDS, self.faculty_rows(), 'faculty'),
+                'courses': self.write(Course, self.COURSE_FIELDS, self.course_rows(), 'course'),
+                'students': self.write(StudentProfile, self.STUDENT_FIELDS, self.student_rows(), 'student'),
+                'registrations': self.write(Registration, self.REGISTRATION_FIELDS, self.registration_rows()),
+            }
+            self.reset_sequences()
+            self.progress('Rebuilding registration counters')
+            rebuild_counters()
+            transaction.on_commit(bump_catalog_version)
+        return counts
+
+    def next_id(self, model):
+        return (model.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+
+    def write(self, model, fields, rows, identifier=None):
+        """
+        Insert `rows`, tuples in the order of `fields`, chunk by chunk. With
+        `identifier`, the first field of every row is a placeholder for a
+        new identifier of that name.
+        """
+        written = 0
+        for chunk in chunks(rows, self.batch_size):
+            if identifier:
+                identifiers = new_identifiers(identifier, len(chunk))
+                chunk = [(identifier_value, *row[1:]) for identifier_value, row in zip(identifiers, chunk)]
+            if self.use_copy:
+                self.copy(model, fields, chunk)
+            else:
+                self.insert(model, fields, chunk)
+            written += len(chunk)
+            self.progress(f'{model._meta.verbose_name_plural}: {written}')
+        return written
+
+    def copy(self, model, fields, rows):
+        quote = self.connection.ops.quote_name
+        columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+        with self.connection.cursor() as cursor:
+            with cursor.copy(f'COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def insert(self, model, fields, rows):
+        # One executemany per chunk; bulk_create spends most of its time
+        # building model instances and compiling the statement.
+        quote = self.connection.ops.quote_name
+        fields = [model._meta.get_field(field) for field in fields]
+        columns = ', '.join(quote(field.column) for field in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        datetimes = [index for index, field in enumerate(fields) if field.get_internal_type() == 'DateTimeField']
+        if datetimes:
+            adapt = self.connection.ops.adapt_datetimefield_value
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in datetimes:
+                    row[index] = adapt(row[index])
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
+
+    def reset_sequences(self):
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), [User, FacultyProfile, Course, StudentProfile, Registration]
+        )
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    USER_FIELDS = [
+        'id', 'password', 'is_superuser', 'username', 'is_active', 'is_staff', 'created_at', 'modified_at', 'account_type',
+    ]
+
+    def user_rows(self):
+        rng = self.rng('users')
+        for index in range(self.faculty + self.students):
+            user_id = self.user_start + index
+            account_type = 'faculty' if index < self.faculty else 'student'
+            created = self.timestamp(rng)
+            yield (
+                user_id, self.password_hash, False, f'{account_type}-{user_id}', True, False,
+                created, created, account_type,
+            )
+
+    FACULTY_FIELDS = [
+        'faculty_id', 'id', 'user', 'first_name', 'last_name', 'department', 'designation', 'email', 'modified_at',
+    ]
+
+    def faculty_rows(self):
+        rng = self.rng('faculty')
+        for index in range(self.faculty):
+            user_id = self.user_start + index
+            yield (
+                None, self.faculty_start + index, user_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                rng.choice(DEPARTMENTS), rng.choice(DESIGNATIONS), f'faculty-{user_id}@example.edu', self.start,
+            )
+
+    COURSE_FIELDS = [
+        'course_code', 'id', 'course_name', 'description', 'duration', 'difficulty_level', 'instructor',
+        'is_active', 'created_at', 'updated_at', 'pending_count', 'approved_count', 'completed_count',
+    ]
+
+    def course_rows(self):
+        rng = self.rng('courses')
+        for index in range(self.courses):
+            name = f'{rng.choice(COURSE_LEVELS)} {rng.choice(COURSE_SUBJECTS)}'
+            created = self.timestamp(rng)
+            yield (
+                None, self.course_start + index, name, f'{name}: lectures, assignments and a final exam.',
+                rng.choice([28, 56, 84, 112]), rng.randint(1, 3), self.faculty_start + rng.randrange(self.faculty),
+                rng.random() < 0.9, created, created, 0, 0, 0,
+            )
+
+    STUDENT_FIELDS = [
+        'student_id', 'id', 'user', 'first_name', 'last_name', 'email', 'phone_number', 'biography',
+        'preferred_language', 'approved_count', 'modified_at',
+    ]
+
+    def student_rows(self):
+        rng = self.rng('students')
+        for index in range(self.students):
+            user_id = self.user_start + self.faculty + index
+            yield (
+                None, self.student_start + index, user_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                f'student-{user_id}@example.edu', f'9{rng.randrange(10 ** 9):09d}', '',
+                'hindi' if rng.random() < 0.3 else 'english', 0, self.start,
+            )
+
+    REGISTRATION_FIELDS = ['id', 'student', 'course', 'status', 'registration_date', 'updated_at', 'grade']
+
+    def registration_rows(self):
+        rng = self.rng('registrations')
+        per_student, extra = divmod(self.registrations, self.students) if self.students else (0, 0)
+        # The remainder goes to `extra` students picked at random.
+        extra_students = set(rng.sample(range(self.students), extra))
+        registration_id = self.registration_start
+        for index in range(self.students):
+            count = per_student + (1 if index in extra_students else 0)
+            approved = 0
+            for course in self.pick_courses(rng, count):
+                status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+                if status == 'approved':
+                    if approved >= Registration.MAX_APPROVED_COURSES:
+                        status = 'pending'
+                    else:
+                        approved += 1
+                registered = self.timestamp(rng)
+                yield (
+                    registration_id, self.student_start + index, self.course_start + course, status,
+                    registered, registered, rng.choice(GRADES) if status == 'completed' else '',
+                )
+                registration_id += 1
+        assert registration_id - self.registration_start == self.registrations
+
+    def pick_courses(self, rng, count):
+        """`count` distinct course indexes, skewed towards the first courses."""
+        if count > self.courses // 2:
+            return sorted(rng.sample(range(self.courses), count))
+        picked = set()
+        while len(picked) < count:
+            picked.add(int(self.courses * rng.random() ** 2))
+        return sorted(picked)
+
+
+def _is_psycopg3():
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return is_psycopg3
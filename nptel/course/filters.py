@@ -0,0 +1,154 @@
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .models import Course, Registration
+
+
+# Filters
+class CourseCatalogFilter(BaseFilterBackend):
+    """
+    Filter courses by difficulty level, active flag, instructor and the
+    instructor's department. Every filter is backed by an index.
+    """
+    BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        levels = params.get('difficulty_level')
+        if levels:
+            valid_levels = {str(value): value for value, _ in Course.DIFFICULTY_CHOICES}
+            try:
+                queryset = queryset.filter(difficulty_level__in=[valid_levels[level] for level in levels.split(',')])
+            except KeyError:
+                raise ValidationError({'difficulty_level': f"Expected a comma separated list of {', '.join(valid_levels)}."})
+
+        is_active = params.get('is_active')
+        if is_active:
+            try:
+                queryset = queryset.filter(is_active=self.BOOLEAN_VALUES[is_active.lower()])
+            except KeyError:
+                raise ValidationError({'is_active': "Expected true or false."})
+
+        instructor = params.get('instructor')
+        if instructor:
+            queryset = queryset.filter(instructor__faculty_id=instructor)
+
+        department = params.get('department')
+        if department:
+            queryset = queryset.filter(instructor__department=department)
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': 'difficulty_level',
+                'required': False,
+                'in': 'query',
+                'description': 'Comma separated difficulty levels: 1 (Beginner), 2 (Intermediate), 3 (Advanced).',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': 'is_active',
+                'required': False,
+                'in': 'query',
+                'description': 'Only active or only inactive courses.',
+                'schema': {'type': 'boolean'},
+            },
+            {
+                'name': 'instructor',
+                'required': False,
+                'in': 'query',
+                'description': 'Faculty ID of the instructor.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': 'department',
+                'required': False,
+                'in': 'query',
+                'description': 'Department of the instructor.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+
+class RegistrationStatusFilter(BaseFilterBackend):
+    """Filter registrations by a comma separated list of statuses."""
+
+    def filter_queryset(self, request, queryset, view):
+        statuses = request.query_params.get('status')
+        if statuses:
+            valid_statuses = {value for value, _ in Registration.STATUS_CHOICES}
+            statuses = statuses.split(',')
+            if not set(statuses) <= valid_statuses:
+                raise ValidationError({'status': f"Expected a comma separated list of {', '.join(sorted(valid_statuses))}."})
+            queryset = queryset.filter(status__in=statuses)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': 'status',
+                'required': False,
+                'in': 'query',
+                'description': 'Comma separated registration statuses: pending, approved, rejected, completed.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+
+class CourseOrderingFilter(OrderingFilter):
+    """
+    Sort courses by one of the whitelisted fields, newest first by default.
+    Only the first field given counts, and the id is appended in the same
+    direction, so the ordering is a unique key for keyset pagination.
+    """
+    ordering_fields = ['created_at', 'course_name', 'duration', 'difficulty_level']
+
+    def get_default_ordering(self, view):
+        return ['-created_at']
+
+    def get_ordering(self, request, queryset, view):
+        primary = super().get_ordering(request, queryset, view)[0]
+        return [primary, '-id' if primary.startswith('-') else 'id']
+
+
+def course_facets(queryset):
+    """
+    Count courses per difficulty level and per instructor department with a
+    single grouped query.
+    """
+    return summarise_facets(facet_rows(queryset))
+
+
+def facet_rows(queryset):
+    """The grouped query behind `course_facets`."""
+    return (
+        queryset.order_by()
+        .values('difficulty_level', 'instructor__department')
+        .annotate(count=Count('id'))
+    )
+
+
+def summarise_facets(rows):
+    """Build the facets response from the rows of `facet_rows`."""
+    levels = {}
+    departments = {}
+    for row in rows:
+        levels[row['difficulty_level']] = levels.get(row['difficulty_level'], 0) + row['count']
+        department = row['instructor__department']
+        departments[department] = departments.get(department, 0) + row['count']
+
+    labels = dict(Course.DIFFICULTY_CHOICES)
+    return {
+        'difficulty_level': [
+            {'value': level, 'label': labels.get(level), 'count': levels[level]}
+            for level in sorted(levels)
+        ],
+        'department': [
+            {'value': department, 'count': count}
+            for department, count in sorted(departments.items(), key=lambda item: (-item[1], item[0] or ''))
+        ],
+    }
@@ -0,0 +1,189 @@
+"""
+Small HTTP load generator for the benchmark commands.
+
+Every simulated client keeps one HTTP/1.1 keep-alive connection open and
+sends its requests back to back, so `concurrency` is the number of requests
+in flight. It only depends on asyncio and is accurate enough to compare two
+deployments on the same machine; the driver itself tops out at a few
+thousand requests per second per core.
+"""
+import asyncio
+import re
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+class Target:
+    """
+    A request to send: method, path, extra headers and an optional body.
+
+    Requests that must differ every time, e.g. to create a new account,
+    pass a `factory` returning a fresh (path, headers, body) per request.
+    """
+
+    def __init__(self, path, method='GET', headers=None, body=b'', name=None, factory=None):
+        self.path = path
+        self.method = method
+        self.headers = headers or {}
+        self.body = body
+        self.name = name or f'{method} {path}'
+        self.factory = factory
+
+    def render(self):
+        if self.factory is not None:
+            return self.factory()
+        return self.path, self.headers, self.body
+
+
+SERVER_TIMING_QUERIES = re.compile(r'db;desc="(\d+) queries"')
+
+
+def server_timing_queries(headers):
+    """Query count reported in the Server-Timing header, see nptel/middleware.py."""
+    match = SERVER_TIMING_QUERIES.search(headers.get('server-timing', ''))
+    return int(match.group(1)) if match else None
+
+
+def percentile(values, fraction):
+    """`fraction` percentile of a sorted list, nearest rank."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summarise(latencies, statuses, errors, elapsed, queries=None):
+    """
+    Throughput and latency percentiles (milliseconds) of one load run, and
+    the queries per request when the server reported them.
+    """
+    latencies = sorted(latencies)
+    summary = {
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': dict(sorted(Counter(statuses).items())),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50': _ms(percentile(latencies, 0.50)),
+        'p95': _ms(percentile(latencies, 0.95)),
+        'p99': _ms(percentile(latencies, 0.99)),
+        'max': _ms(latencies[-1] if latencies else None),
+    }
+    if queries:
+        summary['queries'] = round(sum(queries) / len(queries), 2)
+        summary['queries_max'] = max(queries)
+    return summary
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, target):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        path, extra_headers, body = target.render()
+        headers = {
+            'Host': f'{self.host}:{self.port}',
+            'Connection': 'keep-alive',
+            'Content-Length': str(len(body)),
+            **extra_headers,
+        }
+        head = f'{target.method} {path} HTTP/1.1\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers.items())
+        self.writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await self.writer.drain()
+        return await self.read_response(target.method)
+
+    async def read_response(self, method):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by the server.')
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304):
+            pass
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while size := int((await self.reader.readline()).split(b';')[0], 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.read()
+            self.close()
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, headers
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _client(base, targets, offset, deadline, results):
+    connection = Connection(base.hostname, base.port or 80)
+    index = offset
+    try:
+        while time.perf_counter() < deadline:
+            target = targets[index % len(targets)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                status, headers = await connection.request(target)
+            except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError):
+                connection.close()
+                results[target.name]['errors'] += 1
+                # Do not spin while the server refuses connections.
+                await asyncio.sleep(0.01)
+                continue
+            results[target.name]['latencies'].append(time.perf_counter() - started)
+            results[target.name]['statuses'].append(status)
+            queries = server_timing_queries(headers)
+            if queries is not None:
+                results[target.name]['queries'].append(queries)
+    finally:
+        connection.close()
+
+
+async def run_load(base_url, targets, concurrency=100, duration=10.0):
+    """
+    Send `targets` round robin from `concurrency` clients for `duration`
+    seconds. Returns an overall summary and one per target name.
+    """
+    base = urlsplit(base_url)
+    results = {target.name: {'latencies': [], 'statuses': [], 'errors': 0, 'queries': []} for target in targets}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _client(base, targets, offset, deadline, results) for offset in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    per_target = {
+        name: summarise(result['latencies'], result['statuses'], result['errors'], elapsed, result['queries'])
+        for name, result in results.items()
+    }
+    overall = summarise(
+        [latency for result in results.values() for latency in result['latencies']],
+        [status for result in results.values() for status in result['statuses']],
+        sum(result['errors'] for result in results.values()),
+        elapsed,
+        [count for result in results.values() for count in result['queries']],
+    )
+    return {'overall': overall, 'targets': per_target}
+
+
+def load(base_url, targets, concurrency=100, duration=10.0):
+    """Blocking wrapper around `run_load`."""
+    return asyncio.run(run_load(base_url, targets, concurrency, duration))
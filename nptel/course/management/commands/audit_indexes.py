@@ -0,0 +1,144 @@
+"""
+Django command to check that the queries of the course endpoints are covered by indexes.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from course.models import Course, Registration
+from nptel.explain import explain
+from user.models import StudentProfile
+
+
+# Full scans that are expected, keyed by database vendor, URL name and table.
+EXPECTED_FULL_SCANS = {
+    # SQLite has no trigram indexes, search falls back to substring matches.
+    ('sqlite', 'course-search', 'course_course'),
+}
+
+
+class Command(BaseCommand):
+    """Django command to audit the query plans of the course endpoints."""
+    help = (
+        "Call every endpoint of course/views.py against the configured database, inside a "
+        "transaction that is rolled back, and explain each SELECT it runs: EXPLAIN (ANALYZE) on "
+        "PostgreSQL, EXPLAIN QUERY PLAN on SQLite. Fails when a query reads a large table in "
+        "full or takes longer than --max-ms. Fill the database with generate_data first, "
+        "plans of small tables say little."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-ms', type=float, default=100, help="Time budget per query in milliseconds.")
+        parser.add_argument('--min-rows', type=int, default=1000,
+                            help="Full scans of tables with fewer rows are not reported.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f"Query plans are not supported on {connection.vendor}.")
+        course = (
+            Course.objects.select_related('instructor__user')
+            .order_by(-(F('pending_count') + F('approved_count') + F('completed_count')))
+            .first()
+        )
+        if course is None:
+            raise CommandError("There are no courses, fill the database with generate_data first.")
+        student = (
+            StudentProfile.objects.select_related('user')
+            .filter(approved_count__lt=Registration.MAX_APPROVED_COURSES)
+            .exclude(registrations__course=course)
+            .first()
+        )
+        if student is None:
+            raise CommandError("No student can register for the busiest course, generate more students.")
+
+        self.options = options
+        self.row_counts = {}
+        self.findings = []
+        # No cached responses and no replicas: every query runs on this database.
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=caches, DATABASE_REPLICAS=[], REQUEST_SAMPLE_RATE=0):
+            with transaction.atomic():
+                self.audit_endpoints(course, student)
+                transaction.set_rollback(True)
+
+        if self.findings:
+            for finding in self.findings:
+                self.stderr.write(finding)
+            raise CommandError(f"{len(self.findings)} query plan(s) need an index or are over budget.")
+        self.stdout.write(self.style.SUCCESS('Every query is covered by an index and within budget.'))
+
+    def audit_endpoints(self, course, student):
+        faculty_token = str(RefreshToken.for_user(course.instructor.user).access_token)
+        student_token = str(RefreshToken.for_user(student.user).access_token)
+        detail = {'course_code': course.course_code}
+
+        self.audit('GET', 'course-list-all', expected_status=200)
+        self.audit('GET', 'course-list-all', data={'difficulty_level': course.difficulty_level}, expected_status=200)
+        for ordering in ('course_name', '-duration', 'difficulty_level'):
+            self.audit('GET', 'course-list-all', data={'ordering': ordering}, expected_status=200)
+        if connection.vendor == 'postgresql':
+            # SQLite never uses an index for a bare boolean condition such as `WHERE is_active`.
+            for ordering in ('course_name', '-duration'):
+                self.audit('GET', 'course-list-all', data={'is_active': 'true', 'ordering': ordering}, expected_status=200)
+        self.audit('GET', 'course-search', data={'q': course.course_name.split()[-1]}, expected_status=200)
+        self.audit('GET', 'course-list-create', token=faculty_token, expected_status=200)
+        self.audit('GET', 'course-detail', kwargs=detail, token=faculty_token, expected_status=200)
+        self.audit('PATCH', 'course-detail', kwargs=detail, data={'description': 'Audited'},
+                   token=faculty_token, expected_status=200)
+        self.audit('GET', 'course-registrations', kwargs=detail, token=faculty_token, expected_status=200)
+        self.audit('GET', 'course-registrations', kwargs=detail, data={'status': 'approved'},
+                   token=faculty_token, expected_status=200)
+        self.audit('GET', 'course-roster', kwargs=detail, token=faculty_token, expected_status=200)
+        self.audit('GET', 'course-statistics', kwargs=detail, token=faculty_token, expected_status=200)
+        self.audit('GET', 'faculty-statistics', token=faculty_token, expected_status=200)
+        self.audit('GET', 'student-registrations', token=student_token, expected_status=200)
+        self.audit('GET', 'student-registrations', data={'status': 'pending'}, token=student_token, expected_status=200)
+        self.audit('POST', 'course-register', kwargs=detail, token=student_token, expected_status=201)
+
+    def audit(self, method, url_name, kwargs=None, data=None, token=None, expected_status=None):
+        """Call an endpoint and explain the SELECT statements it ran."""
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            if not many and sql.lstrip()[:6].upper() == 'SELECT':
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        client = APIClient()
+        if token:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse(url_name, kwargs=kwargs)
+        with connection.execute_wrapper(record):
+            response = getattr(client, method.lower())(url, data, format='json')
+            if response.streaming:
+                response.getvalue()
+        if expected_status is not None and response.status_code != expected_status:
+            raise CommandError(f"{method} {url} returned {response.status_code}: {response.content[:500]!r}")
+
+        for sql, params in statements:
+            plan = explain(sql, params)
+            problems = [
+                f"full scan of {table}" for table in plan.full_scans
+                if self.row_count(table) >= self.options['min_rows']
+                and (connection.vendor, url_name, table) not in EXPECTED_FULL_SCANS
+            ]
+            if plan.duration > self.options['max_ms']:
+                problems.append(f"{plan.duration:.1f} ms, budget is {self.options['max_ms']:g} ms")
+            status = '; '.join(problems) or 'ok'
+            self.stdout.write(f"{method:6} {url_name:20} {plan.duration:9.2f} ms  {status}")
+            if problems:
+                self.findings.append(f"{method} {url_name}: {status}\n{plan.sql}\n{plan.text}\n")
+            elif self.options['verbosity'] > 1:
+                self.stdout.write(f"{plan.sql}\n{plan.text}\n")
+
+    def row_count(self, table):
+        if table not in self.row_counts:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                self.row_counts[table] = cursor.fetchone()[0]
+        return self.row_counts[table]
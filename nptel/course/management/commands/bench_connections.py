@@ -0,0 +1,120 @@
+"""
+Django command to measure the per-request cost of opening database connections.
+"""
+import copy
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from course.loadtest import summarise
+
+
+class Command(BaseCommand):
+    """Django command to compare connection reuse modes."""
+    help = (
+        "Simulate requests against the configured database, each running one query between the "
+        "request_started and request_finished connection checks, once per connection mode: a new "
+        "connection per request, persistent connections with health checks and, on PostgreSQL "
+        "with psycopg 3, a connection pool. Reports latency and connections opened per mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Simulated requests per mode.")
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--query', default='SELECT 1', help="SQL each request runs.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['database'] not in connections:
+            raise CommandError(f"Unknown database {options['database']}.")
+        base = copy.deepcopy(connections[options['database']].settings_dict)
+        base['OPTIONS'].pop('pool', None)
+
+        modes = {
+            'per-request': {**base, 'CONN_MAX_AGE': 0},
+            'persistent': {**base, 'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': True},
+        }
+        if self.pool_supported(base):
+            modes['pool'] = {
+                **base, 'CONN_MAX_AGE': 0,
+                'OPTIONS': {**base['OPTIONS'], 'pool': {'min_size': 1, 'max_size': 2}},
+            }
+        else:
+            self.stdout.write("Skipping the pool mode, it needs PostgreSQL with psycopg 3.")
+
+        results = {}
+        for mode, settings_dict in modes.items():
+            results[mode] = self.run_mode(mode, settings_dict, options)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+    def pool_supported(self, settings_dict):
+        if load_backend(settings_dict['ENGINE']).DatabaseWrapper.vendor != 'postgresql':
+            return False
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        return is_psycopg3
+
+    def run_mode(self, mode, settings_dict, options):
+        wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias=f'bench-{mode}')
+        opened = 0
+
+        def count(sender, connection, **kwargs):
+            nonlocal opened
+            if connection is wrapper:
+                opened += 1
+
+        connection_created.connect(count, weak=False)
+        try:
+            self.simulate(wrapper, options['warmup'], options['query'])
+            opened = 0
+            started = time.perf_counter()
+            latencies = self.simulate(wrapper, options['requests'], options['query'])
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count)
+            wrapper.close()
+            if mode == 'pool':
+                wrapper.close_pool()
+
+        summary = summarise(latencies, [], 0, elapsed)
+        summary['connections_opened'] = opened
+        summary['mean'] = round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None
+        return summary
+
+    def simulate(self, wrapper, requests, query):
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            # What django.db.close_old_connections does on request_started.
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute(query)
+                cursor.fetchall()
+            # And on request_finished.
+            wrapper.close_if_unusable_or_obsolete()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    def report(self, results):
+        self.stdout.write(f"{'mode':12} {'requests':>9} {'opened':>7} {'mean':>9} {'p50':>9} {'p99':>9}")
+        for mode, summary in results.items():
+            self.stdout.write(
+                f"{mode:12} {summary['requests']:9} {summary['connections_opened']:7} {summary['mean'] or 0:9.3f} "
+                f"{summary['p50'] or 0:9.3f} {summary['p99'] or 0:9.3f}"
+            )
+        baseline = results['per-request']['mean']
+        for mode, summary in results.items():
+            if mode != 'per-request' and baseline and summary['mean'] is not None:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{mode}: {baseline - summary['mean']:.3f} ms less per request than a new connection "
+                    f"({baseline / summary['mean']:.1f}x faster)."
+                ))
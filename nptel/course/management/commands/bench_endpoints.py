@@ -0,0 +1,374 @@
+"""
+Django command to benchmark every API endpoint and gate regressions.
+"""
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from course.counters import rebuild_counters
+from course.loadtest import Target, load
+from course.management.testdb import throwaway_database
+from course.models import Course, Registration
+from user.identifiers import assign_identifiers
+from user.models import User, FacultyProfile, StudentProfile
+from user.tokens import tokens_for_user
+
+
+PASSWORD = 'Bench-Endpoints-1'
+# Endpoints that would saturate the machine at full concurrency.
+CONCURRENCY_LIMITS = {'POST account-import': 1}
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the endpoints of the course and user apps."""
+    help = (
+        "Seed a throwaway database with courses, students and registrations, serve it from an "
+        "in-process threaded WSGI server and drive every endpoint of course/urls.py and "
+        "user/urls.py in turn at the given concurrency. Records requests per second, p50/p95/p99 "
+        "latency and queries per request (from the Server-Timing header), optionally to a JSON "
+        "baseline. With --compare, fails if an endpoint answered with a 5xx, failed more often "
+        "than in the baseline or regressed beyond the thresholds. Course deletion is not driven, "
+        "it would run out of courses. Run it against PostgreSQL for meaningful numbers; SQLite "
+        "serializes every write."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=200)
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--registrations', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=5.0, help="Seconds per endpoint.")
+        parser.add_argument('--warmup', type=float, default=1.0, help="Seconds per endpoint before measuring.")
+        parser.add_argument('--endpoint', action='append', default=[],
+                            help="Only run endpoints whose name contains this text, repeatable.")
+        parser.add_argument('--output', help="Write the results as a JSON baseline to this file.")
+        parser.add_argument('--compare', help="Baseline JSON file to compare the results with.")
+        parser.add_argument('--max-latency-regression', type=float, default=0.25,
+                            help="Allowed relative p95 latency increase.")
+        parser.add_argument('--latency-floor', type=float, default=2.0,
+                            help="p95 increases below this many milliseconds are never regressions.")
+        parser.add_argument('--max-throughput-regression', type=float, default=0.25,
+                            help="Allowed relative drop in requests per second.")
+        parser.add_argument('--max-query-increase', type=int, default=0,
+                            help="Allowed increase of the maximum queries per request.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        with self.test_database(), throwaway_database(), quiet_loggers(), override_settings(
+            DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'], REQUEST_SAMPLE_RATE=1.0, SERVER_TIMING=True,
+        ):
+            self.stdout.write("Seeding ...")
+            self.seed(options['courses'], options['students'], options['registrations'], random.Random(options['seed']))
+            targets = self.targets(random.Random(options['seed']))
+            if options['endpoint']:
+                targets = [t for t in targets if any(text in t.name for text in options['endpoint'])]
+            with serve() as url:
+                endpoints = {}
+                for target in targets:
+                    concurrency = min(options['concurrency'], CONCURRENCY_LIMITS.get(target.name, options['concurrency']))
+                    self.stdout.write(f"{target.name} ...")
+                    load(url, [target], concurrency, options['warmup'])
+                    endpoints[target.name] = load(url, [target], concurrency, options['duration'])['overall']
+
+        results = {
+            'settings': {
+                key: options[key]
+                for key in ('courses', 'students', 'registrations', 'seed', 'concurrency', 'duration')
+            },
+            'vendor': connection.vendor,
+            'endpoints': endpoints,
+        }
+        self.report(endpoints)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}.")
+        if baseline is not None:
+            self.compare(baseline, results, options)
+
+    @contextmanager
+    def test_database(self):
+        """Put a SQLite test database in a file, so the server threads share it."""
+        if connection.vendor != 'sqlite' or connection.settings_dict['TEST']['NAME']:
+            yield
+            return
+        with tempfile.TemporaryDirectory() as directory:
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            try:
+                yield
+            finally:
+                connection.settings_dict['TEST']['NAME'] = None
+
+    def seed(self, course_count, student_count, registration_count, rng):
+        if registration_count > course_count * student_count:
+            raise CommandError('--registrations cannot exceed --courses times --students.')
+        # One hash for every account; hashing each password would dominate the seeding.
+        password = make_password(PASSWORD)
+
+        faculty_count = max(1, course_count // 10)
+        users = User.objects.bulk_create(
+            User(username=f'bench-faculty-{i}', password=password, account_type='faculty')
+            for i in range(faculty_count)
+        )
+        faculty = [
+            FacultyProfile(user=user, first_name='Faculty', last_name=str(i), department='CS')
+            for i, user in enumerate(users)
+        ]
+        assign_identifiers(faculty, 'faculty', 'faculty_id')
+        faculty = FacultyProfile.objects.bulk_create(faculty)
+
+        courses = [
+            Course(
+                course_name=f'Course {i}', description=f'Benchmark course {i}', duration=rng.randint(7, 120),
+                difficulty_level=rng.randint(1, 3), instructor=faculty[i % faculty_count],
+            )
+            for i in range(course_count)
+        ]
+        assign_identifiers(courses, 'course', 'course_code')
+        courses = Course.objects.bulk_create(courses)
+
+        users = User.objects.bulk_create(
+            User(username=f'bench-student-{i}', password=password, account_type='student')
+            for i in range(student_count)
+        )
+        students = [StudentProfile(user=user, first_name='Student', last_name=str(i)) for i, user in enumerate(users)]
+        assign_identifiers(students, 'student', 'student_id')
+        students = StudentProfile.objects.bulk_create(students)
+
+        registrations = []
+        approved = {}
+        pairs = rng.sample(range(course_count * student_count), registration_count)
+        for pair in pairs:
+            student, course = students[pair // course_count], courses[pair % course_count]
+            status = rng.choices(['pending', 'approved', 'rejected', 'completed'], [5, 2, 1, 2])[0]
+            if status == 'approved':
+                if approved.get(student.pk, 0) >= Registration.MAX_APPROVED_COURSES:
+                    status = 'pending'
+                else:
+                    approved[student.pk] = approved.get(student.pk, 0) + 1
+            registrations.append(Registration(student=student, course=course, status=status))
+        Registration.objects.bulk_create(registrations, batch_size=1000)
+        rebuild_counters()
+
+        self.faculty = faculty[0]
+        self.courses = courses
+        self.students = students
+        self.registered = {(pair // course_count, pair % course_count) for pair in pairs}
+
+    def targets(self, rng):
+        faculty_tokens = tokens_for_user(self.faculty.user, self.faculty)
+        faculty_auth = auth_header(faculty_tokens['access'])
+        admin = User.objects.create_superuser('bench-admin', PASSWORD)
+        admin_auth = auth_header(str(RefreshToken.for_user(admin).access_token))
+        course = self.courses[0].course_code
+        counter = itertools.count()
+        fresh_pairs = self.fresh_pairs(rng)
+        student_tokens = {}
+
+        def student_auth(index):
+            if index not in student_tokens:
+                student = self.students[index]
+                student_tokens[index] = auth_header(tokens_for_user(student.user, student)['access'])
+            return student_tokens[index]
+
+        def register():
+            student, course_index = next(fresh_pairs)
+            return f'/course/register/{self.courses[course_index].course_code}', student_auth(student), b''
+
+        def register_bulk():
+            pairs = [next(fresh_pairs) for _ in range(5)]
+            return '/course/register/bulk/', json_headers(admin_auth), json_body({
+                'student_ids': [self.students[student].student_id for student, _ in pairs],
+                'course_codes': [self.courses[pairs[0][1]].course_code],
+                'mode': 'best_effort',
+            })
+
+        def create_course():
+            return '/course/faculty-courses/', json_headers(faculty_auth), json_body({
+                'course_name': f'New course {next(counter)}', 'description': 'Created by the benchmark',
+                'duration': 30, 'difficulty_level': 2,
+            })
+
+        def new_account(account_type):
+            def factory():
+                body = {'username': f'bench-new-{next(counter)}', 'password': PASSWORD,
+                        'first_name': 'New', 'last_name': account_type}
+                if account_type == 'faculty':
+                    body['department'] = 'CS'
+                return f'/user/{account_type}/register/', json_headers(), json_body(body)
+            return factory
+
+        def import_accounts():
+            rows = ['username,password,account_type,first_name,last_name']
+            batch = next(counter)
+            rows += [f'bench-import-{batch}-{i},{PASSWORD},student,Import,{i}' for i in range(20)]
+            return '/user/import/', *multipart(admin_auth, 'accounts.csv', '\n'.join(rows).encode())
+
+        def login(account_type, username):
+            body = json_body({'username': username, 'password': PASSWORD})
+            return Target(f'/user/{account_type}/login/', 'POST', json_headers(), body, name=f'POST {account_type}-login')
+
+        return [
+            Target('/course/all-courses/', name='GET course-list-all'),
+            Target('/course/all-courses/?facets=true&difficulty_level=1,2', name='GET course-list-all facets'),
+            Target('/course/search/?q=course', name='GET course-search'),
+            Target('/course/faculty-courses/', headers=faculty_auth, name='GET course-list-create'),
+            Target(None, 'POST', name='POST course-list-create', factory=create_course),
+            Target('/course/faculty-courses/statistics/', headers=faculty_auth, name='GET faculty-statistics'),
+            Target(f'/course/courses/{course}/', headers=faculty_auth, name='GET course-detail'),
+            Target(f'/course/courses/{course}/', 'PATCH', json_headers(faculty_auth),
+                   json_body({'description': 'Patched by the benchmark'}), name='PATCH course-detail'),
+            Target(f'/course/courses/{course}/', 'PUT', json_headers(faculty_auth), json_body({
+                'course_name': 'Course 0', 'description': 'Replaced by the benchmark', 'duration': 45,
+                'difficulty_level': 2, 'is_active': True,
+            }), name='PUT course-detail'),
+            Target(f'/course/courses/{course}/registrations/', headers=faculty_auth, name='GET course-registrations'),
+            Target(f'/course/courses/{course}/roster/', headers=faculty_auth, name='GET course-roster'),
+            Target(f'/course/courses/{course}/statistics/', headers=faculty_auth, name='GET course-statistics'),
+            Target('/course/my-registrations/', headers=student_auth(0), name='GET student-registrations'),
+            Target(None, 'POST', name='POST course-register', factory=register),
+            Target(None, 'POST', name='POST course-register-bulk', factory=register_bulk),
+            login('faculty', self.faculty.user.username),
+            login('student', self.students[0].user.username),
+            Target('/user/token/refresh/', 'POST', json_headers(), json_body({'refresh': faculty_tokens['refresh']}),
+                   name='POST token-refresh'),
+            Target(None, 'POST', name='POST student-register', factory=new_account('student')),
+            Target(None, 'POST', name='POST faculty-register', factory=new_account('faculty')),
+            Target(None, 'POST', name='POST account-import', factory=import_accounts),
+        ]
+
+    def fresh_pairs(self, rng):
+        """(student index, course index) pairs that are not registered yet, endlessly."""
+        student_order = list(range(len(self.students)))
+        rng.shuffle(student_order)
+        for course in itertools.cycle(range(len(self.courses))):
+            for student in student_order:
+                if (student, course) not in self.registered:
+                    self.registered.add((student, course))
+                    yield student, course
+            rng.shuffle(student_order)
+
+    def report(self, endpoints):
+        self.stdout.write(
+            f"{'endpoint':36} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'errors':>7}  statuses"
+        )
+        for name, summary in endpoints.items():
+            statuses = ' '.join(f'{status}:{count}' for status, count in summary['statuses'].items())
+            self.stdout.write(
+                f"{name:36} {summary['rps']:8.1f} {summary['p50'] or 0:8.2f} {summary['p95'] or 0:8.2f} "
+                f"{summary['p99'] or 0:8.2f} {summary.get('queries', 0):8.2f} {summary['errors']:7}  {statuses}"
+            )
+
+    def compare(self, baseline, results, options):
+        regressions = []
+        for name, new in results['endpoints'].items():
+            old = baseline['endpoints'].get(name)
+            server_errors = sum(count for status, count in new['statuses'].items() if int(status) >= 500)
+            if server_errors:
+                regressions.append(f"{name}: {server_errors} server error response(s)")
+            if old is None:
+                continue
+            if failure_share(new) > failure_share(old):
+                regressions.append(
+                    f"{name}: {failure_share(old):.1%} -> {failure_share(new):.1%} of requests failed"
+                )
+            if new['errors'] > old['errors']:
+                regressions.append(f"{name}: {old['errors']} -> {new['errors']} connection errors")
+            if old['p95'] and new['p95'] and (
+                new['p95'] > old['p95'] * (1 + options['max_latency_regression'])
+                and new['p95'] - old['p95'] > options['latency_floor']
+            ):
+                regressions.append(f"{name}: p95 {old['p95']:.2f} ms -> {new['p95']:.2f} ms")
+            if old['rps'] and new['rps'] < old['rps'] * (1 - options['max_throughput_regression']):
+                regressions.append(f"{name}: {old['rps']:.1f} -> {new['rps']:.1f} requests per second")
+            if 'queries_max' in old and new.get('queries_max', 0) > old['queries_max'] + options['max_query_increase']:
+                regressions.append(f"{name}: up to {new['queries_max']} queries per request, was {old['queries_max']}")
+
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(regression)
+            raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
+
+
+def failure_share(summary):
+    """Share of the requests of a summary that got no 2xx or 3xx response."""
+    failed = summary['errors'] + sum(
+        count for status, count in summary['statuses'].items() if not 200 <= int(status) < 400
+    )
+    total = summary['requests'] + summary['errors']
+    return failed / total if total else 0.0
+
+
+def auth_header(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def json_headers(headers=None):
+    return {'Content-Type': 'application/json', **(headers or {})}
+
+
+def json_body(data):
+    return json.dumps(data).encode()
+
+
+def multipart(headers, filename, content):
+    boundary = 'bench-endpoints-boundary'
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: text/csv\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return {'Content-Type': f'multipart/form-data; boundary={boundary}', **headers}, body
+
+
+@contextmanager
+def serve():
+    """Serve the project from a threaded WSGI server on a free port."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@contextmanager
+def quiet_loggers():
+    """Silence per-request logging while the endpoints are driven."""
+    loggers = [logging.getLogger(name) for name in ('nptel.requests', 'django.request', 'django.server')]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
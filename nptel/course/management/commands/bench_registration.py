@@ -0,0 +1,166 @@
+"""
+Django command to benchmark registration admission under contention.
+"""
+import queue
+import random
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+
+from course.counters import (
+    COURSE_COUNTED_STATUSES, STUDENT_COUNTED_STATUSES, expected_course_counters, expected_student_counters,
+)
+from course.management.testdb import throwaway_database
+from course.models import Course, Registration
+from course.services import RegistrationError, register_student
+from user.models import User, FacultyProfile, StudentProfile
+
+
+class Command(BaseCommand):
+    """Django command to benchmark concurrent registrations on a throwaway database."""
+    help = (
+        "Register and approve hundreds of students in parallel threads, report throughput "
+        "and verify that no student ends up with a duplicate or more than 2 approved courses, "
+        "and that the registration counters match the registration table. "
+        "Run it against PostgreSQL for meaningful numbers; SQLite serializes every write."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--courses', type=int, default=5)
+        parser.add_argument('--per-student', type=int, default=3, help="Courses each student registers for.")
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['per_student'] > options['courses']:
+            raise CommandError('--per-student cannot be larger than --courses.')
+
+        if connection.vendor == 'sqlite' and options['threads'] > 1:
+            self.stdout.write(self.style.WARNING(
+                'SQLite test databases do not allow concurrent writers, running with a single thread.'
+            ))
+            options['threads'] = 1
+
+        with throwaway_database():
+            students, courses = self.seed(options['students'], options['courses'])
+            rng = random.Random(options['seed'])
+
+            # Every (student, course) pair is submitted twice to provoke duplicates.
+            registrations = [
+                (student, course)
+                for student in students
+                for course in rng.sample(courses, options['per_student'])
+            ] * 2
+            rng.shuffle(registrations)
+            self.run_phase('register', registrations, self.register, options['threads'])
+
+            # Every approval is submitted twice as well, the counters must only move once.
+            approvals = list(Registration.objects.values_list('pk', flat=True)) * 2
+            rng.shuffle(approvals)
+            self.run_phase('approve', approvals, self.approve, options['threads'])
+
+            self.verify(len(students) * options['per_student'])
+
+    def seed(self, student_count, course_count):
+        password = make_password(None)
+        faculty_user = User.objects.create(username='bench-faculty', password=password, account_type='faculty')
+        faculty = FacultyProfile.objects.get(user=faculty_user)
+        courses = Course.objects.bulk_create(
+            Course(course_name=f'Course {i}', course_code=f'BENCH-{i}', duration=30, difficulty_level=1, instructor=faculty)
+            for i in range(course_count)
+        )
+        users = User.objects.bulk_create(
+            User(username=f'bench-student-{i}', password=password, account_type='student')
+            for i in range(student_count)
+        )
+        students = StudentProfile.objects.bulk_create(StudentProfile(user=user) for user in users)
+        return students, courses
+
+    def register(self, task):
+        student, course = task
+        register_student(student.pk, course)
+
+    def approve(self, registration_id):
+        registration = Registration.objects.get(pk=registration_id)
+        registration.status = 'approved'
+        registration.save()
+
+    def run_phase(self, name, tasks, handler, thread_count):
+        work = queue.Queue()
+        for task in tasks:
+            work.put(task)
+        outcomes = Counter()
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        task = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        handler(task)
+                        outcome = 'ok'
+                    except (RegistrationError, ValidationError):
+                        outcome = 'rejected'
+                    except Exception as exc:
+                        outcome = f'error: {type(exc).__name__}: {exc}'
+                    with lock:
+                        outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{name:9} {len(tasks):6} requests in {elapsed:6.2f}s "
+            f"({len(tasks) / elapsed:8.1f} req/s) with {thread_count} threads"
+        )
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"          {outcome}: {count}")
+
+    def verify(self, expected_registrations):
+        registrations = Registration.objects.count()
+        duplicates = (
+            Registration.objects.values('student', 'course')
+            .annotate(n=Count('id')).filter(n__gt=1).count()
+        )
+        over_limit = (
+            StudentProfile.objects
+            .annotate(approved=Count('registrations', filter=Q(registrations__status='approved')))
+            .filter(approved__gt=Registration.MAX_APPROVED_COURSES).count()
+        )
+        self.stdout.write(f"registrations: {registrations} (expected {expected_registrations})")
+        self.stdout.write(f"duplicate pairs: {duplicates}")
+        stale_counters = (
+            self.stale_counters(expected_course_counters(), COURSE_COUNTED_STATUSES)
+            + self.stale_counters(expected_student_counters(), STUDENT_COUNTED_STATUSES)
+        )
+        self.stdout.write(f"students over the approved-course limit: {over_limit}")
+        self.stdout.write(f"stale counters: {stale_counters}")
+        if registrations != expected_registrations or duplicates or over_limit or stale_counters:
+            raise CommandError('Registration invariants violated.')
+        self.stdout.write(self.style.SUCCESS('Registration invariants hold.'))
+
+    def stale_counters(self, queryset, statuses):
+        fields = [field for status in statuses for field in (f'{status}_count', f'expected_{status}')]
+        return sum(
+            row[f'{status}_count'] != row[f'expected_{status}']
+            for row in queryset.values(*fields).iterator()
+            for status in statuses
+        )
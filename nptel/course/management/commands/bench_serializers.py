@@ -0,0 +1,88 @@
+"""
+Django command to compare the per-row cost of the model and values() serializers.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from course.datagen import DataGenerator
+from course.management.testdb import throwaway_database
+from course.models import Course, Registration
+from course.serializers import (
+    CourseDetailSerializer, CourseDetailValuesSerializer, RegistrationSerializer, RegistrationValuesSerializer,
+)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark list serialization on a throwaway database."""
+    help = (
+        "Serialize every course and registration of a generated dataset with the ModelSerializer "
+        "and with its values() fast path, report the query and serialization cost per row of "
+        "each and fail if their JSON output differs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=2000)
+        parser.add_argument('--registrations', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per case, the fastest one counts.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['courses'] < 1 or options['registrations'] < 1:
+            raise CommandError('--courses and --registrations must be positive.')
+
+        with throwaway_database():
+            DataGenerator(
+                faculty=max(1, options['courses'] // 10), courses=options['courses'],
+                students=max(1, options['registrations'] // 5), registrations=options['registrations'],
+            ).run()
+
+            courses = Course.objects.order_by('-created_at', '-id')
+            registrations = Registration.objects.order_by('-registration_date', '-id')
+            cases = {
+                'courses': (
+                    lambda: courses.select_related('instructor'),
+                    lambda rows: CourseDetailSerializer(rows, many=True).data,
+                    lambda: CourseDetailValuesSerializer.values(courses),
+                    lambda rows: CourseDetailValuesSerializer(rows).data,
+                ),
+                'registrations': (
+                    lambda: registrations.select_related('student__user', 'course__instructor'),
+                    lambda rows: RegistrationSerializer(rows, many=True).data,
+                    lambda: RegistrationValuesSerializer.values(registrations),
+                    lambda rows: RegistrationValuesSerializer(rows).data,
+                ),
+            }
+
+            self.stdout.write(f"{'case':14} {'serializer':10} {'rows':>7} {'query us/row':>13} {'serialize us/row':>17}")
+            for name, (model_query, model_serialize, values_query, values_serialize) in cases.items():
+                model = self.measure(model_query, model_serialize, options['repeat'])
+                values = self.measure(values_query, values_serialize, options['repeat'])
+                if JSONRenderer().render(model['data']) != JSONRenderer().render(values['data']):
+                    raise CommandError(f"The values() output of {name} differs from the ModelSerializer output.")
+                for label, result in (('model', model), ('values', values)):
+                    self.stdout.write(
+                        f"{name:14} {label:10} {result['rows']:7} {result['query']:13.2f} {result['serialize']:17.2f}"
+                    )
+                speedup = (model['query'] + model['serialize']) / (values['query'] + values['serialize'])
+                self.stdout.write(self.style.SUCCESS(f"{name}: identical output, {speedup:.1f}x faster per row."))
+
+    def measure(self, query, serialize, repeat):
+        """Best per-row microseconds of fetching and of serializing."""
+        best_query = best_serialize = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = list(query())
+            fetched = time.perf_counter()
+            data = serialize(rows)
+            finished = time.perf_counter()
+            best_query = min(best_query, fetched - started)
+            best_serialize = min(best_serialize, finished - fetched)
+        count = max(len(rows), 1)
+        return {
+            'rows': len(rows),
+            'query': best_query / count * 1e6,
+            'serialize': best_serialize / count * 1e6,
+            'data': data,
+        }
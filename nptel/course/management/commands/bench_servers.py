@@ -0,0 +1,107 @@
+"""
+Django command to compare the WSGI and ASGI deployments under load.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from course.loadtest import Target, load
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the read endpoints on WSGI and ASGI servers."""
+    help = (
+        "Drive the read-only course endpoints on a WSGI and an ASGI server at the same concurrency "
+        "and compare requests per second and latency percentiles. Either point it at running "
+        "servers with --wsgi-url/--asgi-url or let it start both with gunicorn using --start. "
+        "Both servers use the configured database, which should already contain data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8002')
+        parser.add_argument('--start', action='store_true', help="Start both servers with gunicorn.conf.py.")
+        parser.add_argument('--workers', type=int, default=2, help="Workers per server with --start.")
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument('--duration', type=float, default=15.0, help="Seconds per server.")
+        parser.add_argument('--warmup', type=float, default=2.0)
+        parser.add_argument('--path', action='append', default=[], help="Extra path to request, repeatable.")
+        parser.add_argument('--token', help="Faculty access token for the course detail and registration endpoints.")
+        parser.add_argument('--course', help="Course code of the faculty for the detail and registration endpoints.")
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        targets = [Target('/course/all-courses/'), Target('/course/all-courses/?difficulty_level=1,2')]
+        if options['token'] and options['course']:
+            headers = {'Authorization': f"Bearer {options['token']}"}
+            targets += [
+                Target(f"/course/courses/{options['course']}/", headers=headers),
+                Target(f"/course/courses/{options['course']}/registrations/", headers=headers),
+            ]
+        targets += [Target(path) for path in options['path']]
+
+        servers = {'wsgi': options['wsgi_url'], 'asgi': options['asgi_url']}
+        processes = []
+        try:
+            if options['start']:
+                for interface, url in servers.items():
+                    processes.append(self.start_server(interface, url, options['workers']))
+
+            results = {}
+            for interface, url in servers.items():
+                self.stdout.write(f"Benchmarking {interface} at {url} ...")
+                load(url, targets, options['concurrency'], options['warmup'])
+                results[interface] = load(url, targets, options['concurrency'], options['duration'])
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait(timeout=30)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+    def start_server(self, interface, url, workers):
+        address = urlsplit(url)
+        command = [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+            '--bind', f'{address.hostname}:{address.port}', f'nptel.{interface}:application',
+        ]
+        environment = {**os.environ, 'GUNICORN_WORKERS': str(workers), 'GUNICORN_LOG_LEVEL': 'warning'}
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=environment)
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"The {interface} server exited with code {process.returncode}.")
+            try:
+                socket.create_connection((address.hostname, address.port), timeout=1).close()
+                return process
+            except OSError:
+                time.sleep(0.2)
+        process.terminate()
+        raise CommandError(f"The {interface} server did not start listening on {url}.")
+
+    def report(self, results):
+        self.stdout.write(f"{'':6} {'target':50} {'rps':>9} {'p50':>9} {'p99':>9} {'errors':>7}")
+        for interface, result in results.items():
+            for name, summary in [('all', result['overall']), *result['targets'].items()]:
+                self.stdout.write(
+                    f"{interface:6} {name:50} {summary['rps']:9.1f} {summary['p50'] or 0:9.2f} "
+                    f"{summary['p99'] or 0:9.2f} {summary['errors']:7}"
+                )
+        wsgi, asgi = results['wsgi']['overall'], results['asgi']['overall']
+        if wsgi['rps'] and wsgi['p99'] and asgi['p99']:
+            self.stdout.write(self.style.SUCCESS(
+                f"ASGI/WSGI: {asgi['rps'] / wsgi['rps']:.2f}x requests per second, "
+                f"{asgi['p99'] / wsgi['p99']:.2f}x p99 latency."
+            ))
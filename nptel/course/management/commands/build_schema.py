@@ -0,0 +1,20 @@
+"""
+Django command to build the OpenAPI schema served by the API.
+"""
+from django.core.management.base import BaseCommand
+
+from nptel.schema import generate_schema, write_schema
+
+
+class Command(BaseCommand):
+    """Django command to render and store the OpenAPI schema."""
+    help = "Render the OpenAPI schema as YAML and JSON with gzip copies and ETags into SCHEMA_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help="Output directory, defaults to SCHEMA_DIR.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        for path in write_schema(generate_schema(), options['directory']):
+            self.stdout.write(f"Wrote {path}")
+        self.stdout.write(self.style.SUCCESS('OpenAPI schema built.'))
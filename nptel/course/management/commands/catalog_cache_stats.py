@@ -0,0 +1,27 @@
+"""
+Django command to show the catalog cache counters.
+"""
+from django.core.management.base import BaseCommand
+
+from course.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    """Django command to show catalog cache hits and misses."""
+    help = "Show the hit/miss counters and the version of the course catalog cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after printing them.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        stats = get_cache_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / lookups if lookups else 0
+        self.stdout.write(f"version:  {stats['version']}")
+        self.stdout.write(f"hits:     {stats['hits']}")
+        self.stdout.write(f"misses:   {stats['misses']}")
+        self.stdout.write(f"hit rate: {hit_rate:.1%}")
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
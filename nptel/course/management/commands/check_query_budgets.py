@@ -0,0 +1,133 @@
+"""
+Django command to check every API endpoint against its query budget.
+"""
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from course.management.testdb import throwaway_database
+from nptel.querybudget import QueryBudgetExceeded, endpoint_query_budget
+from user.authentication import revocation_cache
+from user.models import User, StudentProfile
+
+
+class Command(BaseCommand):
+    """Django command to check endpoint query budgets on a throwaway database."""
+    help = "Call every endpoint against a test database and fail if one exceeds its query budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=30, help="Number of courses and students to create.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        self.failures = []
+        # The JWT revocation list is loaded on the first authenticated read and
+        # then every JWT_REVOCATION_CACHE_TTL seconds, and every account is
+        # checked for existence once in that period. Load the list and confirm
+        # the accounts up front, so those queries do not count against
+        # whichever endpoint runs at the time.
+        with throwaway_database(), override_settings(JWT_REVOCATION_CACHE_TTL=24 * 60 * 60):
+            revocation_cache.refresh()
+            self.run_checks(options['rows'])
+
+        if self.failures:
+            for failure in self.failures:
+                self.stderr.write(str(failure))
+            raise CommandError(f"{len(self.failures)} endpoint(s) exceeded their query budget.")
+        self.stdout.write(self.style.SUCCESS('All endpoints are within their query budgets.'))
+
+    def call(self, method, url_name, kwargs=None, data=None, token=None, expected_status=None, format='json', **headers):
+        """Call an endpoint under its query budget and return the response."""
+        client = APIClient()
+        if token:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse(url_name, kwargs=kwargs)
+        try:
+            with endpoint_query_budget(url_name, method) as context:
+                response = getattr(client, method.lower())(url, data, format=format, **headers)
+                if response.streaming:
+                    # Streamed bodies run their queries while being consumed.
+                    response.getvalue()
+        except QueryBudgetExceeded as exc:
+            self.failures.append(exc)
+            return None
+        if expected_status is not None and response.status_code != expected_status:
+            raise CommandError(f"{method} {url} returned {response.status_code}: {response.content[:500]!r}")
+        self.stdout.write(f"{method:6} {url_name:20} {len(context):3} queries")
+        return response
+
+    def confirm_accounts(self):
+        for user_id in User.objects.values_list('pk', flat=True):
+            revocation_cache.is_revoked(user_id)
+
+    def run_checks(self, rows):
+        password = 'Budget-Check-1'
+        self.call('POST', 'faculty-register', data={
+            'username': 'budget-faculty', 'password': password,
+            'first_name': 'Budget', 'last_name': 'Faculty', 'department': 'CS',
+        }, expected_status=201)
+        response = self.call('POST', 'faculty-login', data={'username': 'budget-faculty', 'password': password}, expected_status=200)
+        faculty_token = response.data['token']['access'] if response else None
+
+        course_codes = []
+        for i in range(rows):
+            response = self.call('POST', 'course-list-create', data={
+                'course_name': f'Course {i}', 'description': 'Budget check', 'duration': 30, 'difficulty_level': 1,
+            }, token=faculty_token, expected_status=201)
+            if response:
+                course_codes.append(response.data['course_code'])
+
+        student_tokens = []
+        for i in range(rows):
+            response = self.call('POST', 'student-register', data={
+                'username': f'budget-student-{i}', 'password': password, 'first_name': 'Budget', 'last_name': str(i),
+            }, expected_status=201)
+            if response:
+                student_tokens.append(response.data['token']['access'])
+        self.call('POST', 'student-login', data={'username': 'budget-student-0', 'password': password}, expected_status=200)
+
+        for token in student_tokens:
+            self.call('POST', 'course-register', kwargs={'course_code': course_codes[0]}, token=token, expected_status=201)
+        self.confirm_accounts()
+        response = self.call('GET', 'student-registrations', token=student_tokens[0], expected_status=200)
+        if response:
+            self.call('GET', 'student-registrations', token=student_tokens[0], expected_status=304,
+                      HTTP_IF_NONE_MATCH=response['ETag'])
+        self.call('GET', 'student-registrations', data={'status': 'pending'}, token=student_tokens[0], expected_status=200)
+
+        admin = User.objects.create_superuser('budget-admin', password)
+        admin_token = str(RefreshToken.for_user(admin).access_token)
+        self.confirm_accounts()
+        self.call('POST', 'course-register-bulk', data={
+            'student_ids': list(StudentProfile.objects.exclude(user=admin).values_list('student_id', flat=True)),
+            'course_codes': course_codes[1:3],
+        }, token=admin_token, expected_status=201)
+
+        lines = ['username,password,account_type,first_name,last_name']
+        lines += [f"budget-import-{i},{password},{'faculty' if i % 2 else 'student'},Import,{i}" for i in range(rows)]
+        accounts = io.BytesIO('\n'.join(lines).encode())
+        accounts.name = 'accounts.csv'
+        self.call('POST', 'account-import', data={'file': accounts}, token=admin_token, expected_status=201, format='multipart')
+        self.call('GET', 'database-stats', token=admin_token, expected_status=200)
+
+        self.call('GET', 'course-list-all', data={'facets': 'true', 'difficulty_level': '1'}, expected_status=200)
+        self.call('GET', 'course-search', data={'q': 'course'}, expected_status=200)
+        self.call('GET', 'course-list-create', token=faculty_token, expected_status=200)
+        detail = {'course_code': course_codes[0]}
+        self.call('GET', 'course-registrations', kwargs=detail, data={'status': 'pending'}, token=faculty_token, expected_status=200)
+        self.call('GET', 'course-roster', kwargs=detail, token=faculty_token, expected_status=200)
+        self.call('GET', 'course-statistics', kwargs=detail, token=faculty_token, expected_status=200)
+        self.call('GET', 'course-statistics', kwargs=detail, data={'period': 'day', 'cached': 'true'}, token=faculty_token, expected_status=200)
+        self.call('GET', 'faculty-statistics', data={'period': 'week'}, token=faculty_token, expected_status=200)
+        self.call('GET', 'course-roster', kwargs=detail, data={'export_format': 'ndjson', 'status': 'pending'},
+                  token=faculty_token, expected_status=200, HTTP_ACCEPT_ENCODING='gzip')
+        self.call('GET', 'course-detail', kwargs=detail, token=faculty_token, expected_status=200)
+        self.call('PATCH', 'course-detail', kwargs=detail, data={'description': 'Updated'}, token=faculty_token, expected_status=200)
+        self.call('PUT', 'course-detail', kwargs=detail, data={
+            'course_name': 'Course 0', 'description': 'Replaced', 'duration': 45, 'difficulty_level': 2, 'is_active': True,
+        }, token=faculty_token, expected_status=200)
+        self.call('DELETE', 'course-detail', kwargs=detail, token=faculty_token, expected_status=200)
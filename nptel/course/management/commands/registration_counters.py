@@ -0,0 +1,51 @@
+"""
+Django command to verify or rebuild the denormalized registration counters.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from course.cache import bump_catalog_version
+from course.counters import (
+    COURSE_COUNTED_STATUSES,
+    STUDENT_COUNTED_STATUSES,
+    expected_course_counters,
+    expected_student_counters,
+    rebuild_counters,
+)
+
+
+class Command(BaseCommand):
+    """Django command to verify or rebuild registration counters."""
+    help = "Compare the registration counters on courses and students with the registration table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every counter instead of only verifying.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['rebuild']:
+            with transaction.atomic():
+                rebuild_counters()
+                transaction.on_commit(bump_catalog_version)
+            self.stdout.write(self.style.SUCCESS('Registration counters rebuilt.'))
+            return
+
+        mismatches = 0
+        mismatches += self.compare('Course', expected_course_counters(), COURSE_COUNTED_STATUSES, 'course_code')
+        mismatches += self.compare('Student', expected_student_counters(), STUDENT_COUNTED_STATUSES, 'student_id')
+        if mismatches:
+            raise CommandError(f"{mismatches} counter(s) out of date, run with --rebuild to fix them.")
+        self.stdout.write(self.style.SUCCESS('Registration counters are up to date.'))
+
+    def compare(self, label, queryset, statuses, identifier):
+        mismatches = 0
+        fields = [identifier]
+        for status in statuses:
+            fields += [f'{status}_count', f'expected_{status}']
+        for row in queryset.values(*fields).iterator():
+            for status in statuses:
+                stored, expected = row[f'{status}_count'], row[f'expected_{status}']
+                if stored != expected:
+                    mismatches += 1
+                    self.stdout.write(f"{label} {row[identifier]}: {status}_count is {stored}, expected {expected}")
+        return mismatches
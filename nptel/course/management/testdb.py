@@ -0,0 +1,25 @@
+"""
+Helpers for management commands that run against a throwaway database.
+"""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def throwaway_database():
+    """
+    Create a fresh test database for the duration of the block, the same
+    way the test runner does, and destroy it afterwards. Replicas are not
+    used, all queries run on the test database.
+    """
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with override_settings(DATABASE_REPLICAS=[]):
+            yield
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
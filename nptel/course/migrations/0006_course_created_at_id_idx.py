@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0005_alter_course_course_code_alter_course_description'),
+        ('user', '0002_alter_facultyprofile_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-created_at', '-id'], name='course_created_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 15:24
+
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model('course', 'Course')
+    Registration = apps.get_model('course', 'Registration')
+    StudentProfile = apps.get_model('user', 'StudentProfile')
+
+    course_counts = {}
+    for row in Registration.objects.values('course_id', 'status').annotate(n=models.Count('id')):
+        if row['status'] in ('pending', 'approved', 'completed'):
+            course_counts.setdefault(row['course_id'], {})[f"{row['status']}_count"] = row['n']
+    for course_id, counts in course_counts.items():
+        Course.objects.filter(pk=course_id).update(**counts)
+
+    student_counts = Registration.objects.filter(status='approved').values('student_id').annotate(n=models.Count('id'))
+    for row in student_counts:
+        StudentProfile.objects.filter(pk=row['student_id']).update(approved_count=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0006_course_created_at_id_idx'),
+        ('user', '0003_studentprofile_approved_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-18 15:27
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_SEARCH_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION course_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.course_code, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.course_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER course_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF course_code, course_name, description, search_vector ON course_course
+    FOR EACH ROW EXECUTE FUNCTION course_search_vector_update();
+
+UPDATE course_course SET search_vector = NULL;
+
+CREATE INDEX course_search_vector_idx ON course_course USING gin (search_vector);
+CREATE INDEX course_code_trgm_idx ON course_course USING gin (UPPER(course_code) gin_trgm_ops);
+CREATE INDEX course_name_trgm_idx ON course_course USING gin (course_name gin_trgm_ops);
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS course_name_trgm_idx;
+DROP INDEX IF EXISTS course_code_trgm_idx;
+DROP INDEX IF EXISTS course_search_vector_idx;
+DROP TRIGGER IF EXISTS course_search_vector_trigger ON course_course;
+DROP FUNCTION IF EXISTS course_search_vector_update();
+"""
+
+
+def create_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH_SQL)
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0007_registration_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_objects, drop_search_objects),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0008_course_search'),
+        ('user', '0004_facultyprofile_department_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', 'difficulty_level', '-created_at'], name='course_active_level_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-18 15:42
+
+from django.db import migrations
+
+
+# Numbers each connection reserves at once from a PostgreSQL sequence.
+SEQUENCE_CACHE = 20
+
+
+def seed_course_sequence(apps, schema_editor):
+    """Start course codes above every hexadecimal code already in use."""
+    Course = apps.get_model('course', 'Course')
+    highest = 0
+    for code in Course.objects.values_list('course_code', flat=True).iterator():
+        if code and code.startswith('COURSE-'):
+            try:
+                highest = max(highest, int(code[len('COURSE-'):], 16))
+            except ValueError:
+                pass
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE SEQUENCE IF NOT EXISTS identifier_course_seq START WITH {highest + 1} CACHE {SEQUENCE_CACHE}'
+        )
+    else:
+        IdentifierSequence = apps.get_model('user', 'IdentifierSequence')
+        IdentifierSequence.objects.using(schema_editor.connection.alias).update_or_create(
+            name='course', defaults={'next_value': highest + 1}
+        )
+
+
+def drop_course_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP SEQUENCE IF EXISTS identifier_course_seq')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0009_course_active_level_idx'),
+        ('user', '0005_identifiersequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_course_sequence, drop_course_sequence),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0010_course_code_sequence'),
+        ('user', '0005_identifiersequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['instructor', '-created_at', '-id'], name='course_instructor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['course', '-registration_date', '-id'], name='registration_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['course', 'status'], name='registration_course_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['student'], name='registration_approved_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0011_hot_path_indexes'),
+        ('user', '0006_user_deactivated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['student', '-registration_date', '-id'], name='registration_student_date_idx'),
+        ),
+    ]
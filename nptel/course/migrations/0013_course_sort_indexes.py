@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0012_registration_updated_at'),
+        ('user', '0006_user_deactivated_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', 'course_name', 'id'], name='course_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', 'duration', 'id'], name='course_active_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0013_course_sort_indexes'),
+        ('user', '0007_profile_modified_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['course_name', 'id'], name='course_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['duration', 'id'], name='course_duration_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['difficulty_level', 'id'], name='course_level_id_idx'),
+        ),
+    ]
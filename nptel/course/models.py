@@ -1,11 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
-from user.models import FacultyProfile, StudentProfile
+from user.models import CounterFieldsMixin, FacultyProfile, StudentProfile
 
 # Models
-class Course(models.Model):
+class Course(CounterFieldsMixin, models.Model):
     """
     Course model to represent a course in the system
     """
@@ -25,6 +26,27 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Registration counters, maintained by course/counters.py
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    approved_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_count = models.PositiveIntegerField(default=0, editable=False)
+    counter_fields = ('pending_count', 'approved_count', 'completed_count')
+
+    # Full-text search document, kept up to date by a trigger on PostgreSQL, see course/search.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='course_created_at_id_idx'),
+            models.Index(fields=['is_active', 'difficulty_level', '-created_at'], name='course_active_level_idx'),
+            models.Index(fields=['instructor', '-created_at', '-id'], name='course_instructor_created_idx'),
+            models.Index(fields=['is_active', 'course_name', 'id'], name='course_active_name_idx'),
+            models.Index(fields=['is_active', 'duration', 'id'], name='course_active_duration_idx'),
+            models.Index(fields=['course_name', 'id'], name='course_name_id_idx'),
+            models.Index(fields=['duration', 'id'], name='course_duration_id_idx'),
+            models.Index(fields=['difficulty_level', 'id'], name='course_level_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.course_name} ({self.course_code})"
 
@@ -38,22 +60,67 @@ class Registration(models.Model):
         ('rejected', 'Rejected'),
         ('completed', 'Completed')
     ]
+    MAX_APPROVED_COURSES = 2
 
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='registrations')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='registrations')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     registration_date = models.DateTimeField(auto_now_add=True)
     grade = models.CharField(max_length=2, blank=True, null=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['student', 'course']
+        indexes = [
+            models.Index(fields=['course', '-registration_date', '-id'], name='registration_course_date_idx'),
+            models.Index(fields=['student', '-registration_date', '-id'], name='registration_student_date_idx'),
+            models.Index(fields=['course', 'status'], name='registration_course_status_idx'),
+            models.Index(fields=['student'], condition=models.Q(status='approved'), name='registration_approved_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so counters can be moved on change.
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def get_stored_status(self):
+        """Return the status currently stored in the database, or None for new rows."""
+        if self._state.adding:
+            return None
+        if not hasattr(self, '_loaded_status'):
+            self._loaded_status = Registration.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+        return self._loaded_status
+
+    def lock_stored_status(self):
+        """
+        Lock the stored row and return its status, or None for new rows.
+        Concurrent saves of the same registration wait here, so each one sees
+        the status the previous one committed.
+        """
+        if self._state.adding:
+            return None
+        return (
+            Registration.objects.select_for_update().filter(pk=self.pk)
+            .values_list('status', flat=True).first()
+        )
 
     def save(self, *args, **kwargs):
-        if self.status == 'approved':
-            approved_count = self.student.registrations.filter(status='approved').exclude(pk=self.pk).count()
-            if approved_count >= 2:
-                raise ValidationError("Students can only register for a maximum of 2 courses.")
-        super().save(*args, **kwargs)
+        # Saves that can approve get a savepoint, so a rejected approval
+        # inside a caller's transaction only undoes this save and the caller
+        # can carry on.
+        with transaction.atomic(savepoint=self.status == 'approved'):
+            stored_status = self.lock_stored_status()
+            if self.status == 'approved' and stored_status != 'approved':
+                # Lock the student row so concurrent approvals are checked one at a time.
+                student = StudentProfile.objects.select_for_update().only('approved_count').get(pk=self.student_id)
+                if student.approved_count >= self.MAX_APPROVED_COURSES:
+                    raise ValidationError("Students can only register for a maximum of 2 courses.")
+            # The counters move from this status, see course/signals.py.
+            self._locked_status = stored_status
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
 
     def __str__(self):
         return f"{self.student} - {self.course}"
\ No newline at end of file
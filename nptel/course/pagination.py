@@ -0,0 +1,223 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+# Pagination
+class Row(Func):
+    """A row value, `(a, b, ...)`, so several columns compare as one key."""
+    function = ''
+
+    def __init__(self, *expressions):
+        super().__init__(*expressions, output_field=Field())
+
+
+class KeysetMixin:
+    """
+    Cursor handling shared by the sync and async keyset paginations.
+
+    `ordering` is a composite key ending in the primary key, every field
+    sorted in the same direction. The cursor holds the ordering values of
+    the boundary row, and the next page is the rows after that row value,
+    `WHERE (key, id) < (%s, %s)`. The database can seek to it in an index
+    on the same fields, so deep pages cost the same as the first one even
+    when many rows share the leading key.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.GET[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def wants_count(self, request):
+        return request.GET.get(self.count_query_param, '').lower() in ('1', 'true')
+
+    def encode_cursor(self, obj, reverse):
+        position = []
+        for field in self.ordering:
+            # Rows are model instances or values() dicts.
+            name = field.lstrip('-')
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            position.append(value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else value)
+        data = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.GET.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = [
+                self.ordering_field(queryset, field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, data['p'], strict=True)
+            ]
+            return position, bool(data['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def ordering_field(self, queryset, name):
+        """The model field or annotation the ordering sorts by."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    def keyset_filter(self, position, reverse):
+        """Rows strictly after `position` in the (possibly reversed) ordering."""
+        descending = {field.startswith('-') for field in self.ordering}
+        if len(descending) != 1:
+            raise ImproperlyConfigured(f"Keyset ordering {self.ordering} must sort every field the same way.")
+        lookup = LessThan if descending.pop() != reverse else GreaterThan
+        return lookup(
+            Row(*[F(field.lstrip('-')) for field in self.ordering]),
+            Row(*[Value(value) for value in position]),
+        )
+
+    def page(self, request, queryset):
+        """
+        The ordered, filtered queryset for the requested page, which yields
+        one row more than the page size, and the decoded cursor.
+        """
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset)
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(position, reverse))
+        return queryset.order_by(*ordering)[:self.page_size + 1], position, reverse
+
+    def links(self, request, rows, has_more, position, reverse):
+        """Trim `rows` to the page, in ordering order, and return the next/previous links."""
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        url = request.build_absolute_uri()
+        has_next = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+        return rows, {
+            'next': replace_query_param(url, self.cursor_query_param, self.encode_cursor(rows[-1], False)) if has_next and rows else None,
+            'previous': replace_query_param(url, self.cursor_query_param, self.encode_cursor(rows[0], True)) if has_previous and rows else None,
+        }
+
+
+class CourseCursorPagination(KeysetMixin, BasePagination):
+    """
+    Keyset pagination for course listings.
+
+    Pages are addressed by the position of the last row seen instead of an
+    OFFSET, so deep pages cost the same as the first one and do not shift
+    when new courses are added. An ordering filter on the view, such as
+    CourseOrderingFilter, replaces the default ordering. The total count is
+    only computed when the client asks for it with `?count=true`.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                return tuple(backend().get_ordering(request, queryset, view))
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.count = queryset.count() if self.wants_count(request) else None
+        page, position, reverse = self.page(request, queryset)
+        rows = list(page)
+        self.rows, self.meta = self.links(request, rows, len(rows) > self.page_size, position, reverse)
+        return self.rows
+
+    def get_paginated_response(self, data):
+        meta = self.meta if self.count is None else {'count': self.count, **self.meta}
+        return Response({**meta, 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Include the total number of results in the response.',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+
+class RegistrationCursorPagination(CourseCursorPagination):
+    """Keyset pagination for registration listings, newest first."""
+    ordering = ('-registration_date', '-id')
+
+
+class SearchCursorPagination(CourseCursorPagination):
+    """
+    Keyset pagination for search results, best matches first. The rank is
+    part of the cursor, so later pages neither count nor skip the matches.
+    """
+    ordering = ('-rank', '-created_at', '-id')
+
+
+class AsyncKeysetPagination(KeysetMixin):
+    """
+    Keyset pagination for the async views in course/async_views.py.
+
+    Takes the same parameters, cursors included, and returns the same
+    response layout as CourseCursorPagination.
+    """
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+        self.page_size = api_settings.PAGE_SIZE
+
+    async def paginate(self, request, queryset):
+        """Return the page of `queryset` requested by `request` and the response metadata."""
+        count = await queryset.acount() if self.wants_count(request) else None
+        page, position, reverse = self.page(request, queryset)
+        rows = [obj async for obj in page]
+        rows, meta = self.links(request, rows, len(rows) > self.page_size, position, reverse)
+        if count is not None:
+            meta = {'count': count, **meta}
+        return rows, meta
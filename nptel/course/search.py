@@ -0,0 +1,59 @@
+"""
+Course search.
+
+On PostgreSQL courses are matched against a stored, weighted tsvector (GIN
+indexed and maintained by a trigger, see migration 0008) plus trigram indexes
+for partial course codes and misspelt names. Other backends fall back to
+plain substring matching, which is good enough for tests and local
+development.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+
+# Must match the text search configuration used by the trigger.
+SEARCH_CONFIG = 'english'
+
+
+def search_courses(queryset, term):
+    """Filter `queryset` down to courses matching `term`, best matches first."""
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, term)
+    return _search_fallback(queryset, term)
+
+
+def _search_postgresql(queryset, term):
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset
+        .filter(
+            Q(search_vector=query)
+            | Q(course_code__istartswith=term)
+            | Q(course_name__trigram_similar=term)
+        )
+        .annotate(rank=(
+            SearchRank(F('search_vector'), query)
+            + TrigramSimilarity('course_name', term)
+            + Case(When(course_code__istartswith=term, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+        ))
+        .order_by('-rank', '-created_at', '-id')
+    )
+
+
+def _search_fallback(queryset, term):
+    return (
+        queryset
+        .filter(
+            Q(course_code__istartswith=term)
+            | Q(course_name__icontains=term)
+            | Q(description__icontains=term)
+        )
+        .annotate(rank=Case(
+            When(course_code__istartswith=term, then=Value(3.0)),
+            When(course_name__icontains=term, then=Value(2.0)),
+            default=Value(1.0),
+            output_field=FloatField(),
+        ))
+        .order_by('-rank', '-created_at', '-id')
+    )
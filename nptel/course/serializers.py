@@ -1,5 +1,9 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.utils import timezone
+from user.models import full_name
+from user.permissions import get_faculty_profile_id
 from .models import Course, Registration
 
 
@@ -27,7 +31,8 @@ class CourseCreateSerializer(serializers.ModelSerializer):
         return obj.instructor.get_full_name()
 
     def create(self, validated_data):
-        validated_data['instructor'] = self.context['request'].user.faculty_profile
+        if 'instructor' not in validated_data and 'instructor_id' not in validated_data:
+            validated_data['instructor_id'] = get_faculty_profile_id(self.context['request'])
         validated_data['is_active'] = True
         return super().create(validated_data)
     
@@ -47,9 +52,12 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             'is_active',
             'instructor',
             'instructor_name', 
+            'pending_count',
+            'approved_count',
+            'completed_count',
             'created_at', 
             'updated_at']
-        read_only_fields = ['id','course_code', 'instructor', 'created_at', 'updated_at']
+        read_only_fields = ['id','course_code', 'instructor', 'pending_count', 'approved_count', 'completed_count', 'created_at', 'updated_at']
 
     def get_instructor_name(self, obj):
         return obj.instructor.get_full_name()
@@ -79,4 +87,108 @@ class RegistrationSerializer(serializers.ModelSerializer):
             "course_duration": obj.course.duration,
             "course_difficulty_level": obj.course.difficulty_level,
             "course_instructor": obj.course.instructor.get_full_name()
-        }
\ No newline at end of file
+        }
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for list endpoints.
+
+    Rows come from `values()` on the queryset, with the related names joined
+    in the same query, and are turned into the exact output of the
+    ModelSerializer the subclass stands in for, without model instances,
+    field objects or method calls per row.
+    """
+    lookups = ()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.lookups)
+
+    @property
+    def data(self):
+        # The ModelSerializer field would look the current timezone up
+        # again for every value.
+        current = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.datetime_field = serializers.DateTimeField(default_timezone=current)
+        return [self.to_representation(row) for row in self.rows]
+
+    def datetime(self, value):
+        return None if value is None else self.datetime_field.to_representation(value)
+
+
+def _string(value):
+    return None if value is None else str(value)
+
+
+class CourseDetailValuesSerializer(ValuesSerializer):
+    """CourseDetailSerializer output from `values()` rows."""
+    lookups = (
+        'id', 'course_name', 'course_code', 'description', 'duration', 'difficulty_level', 'is_active',
+        'instructor_id', 'instructor__first_name', 'instructor__last_name',
+        'pending_count', 'approved_count', 'completed_count', 'created_at', 'updated_at',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'course_name': _string(row['course_name']),
+            'course_code': _string(row['course_code']),
+            'description': _string(row['description']),
+            'duration': row['duration'],
+            'difficulty_level': row['difficulty_level'],
+            'is_active': row['is_active'],
+            'instructor': row['instructor_id'],
+            'instructor_name': full_name(row['instructor__first_name'], row['instructor__last_name']),
+            'pending_count': row['pending_count'],
+            'approved_count': row['approved_count'],
+            'completed_count': row['completed_count'],
+            'created_at': self.datetime(row['created_at']),
+            'updated_at': self.datetime(row['updated_at']),
+        }
+
+
+class RegistrationValuesSerializer(ValuesSerializer):
+    """RegistrationSerializer output from `values()` rows."""
+    lookups = (
+        'id', 'status', 'registration_date', 'grade',
+        'student__first_name', 'student__last_name', 'student__student_id', 'student__user__username', 'student__email',
+        'course__course_name', 'course__course_code', 'course__description', 'course__duration',
+        'course__difficulty_level', 'course__instructor__first_name', 'course__instructor__last_name',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'student': {
+                "name": full_name(row['student__first_name'], row['student__last_name']),
+                "student_id": row['student__student_id'],
+                "username": row['student__user__username'],
+                "email": row['student__email'],
+            },
+            'course': {
+                "course_name": row['course__course_name'],
+                "course_code": row['course__course_code'],
+                "course_description": row['course__description'],
+                "course_duration": row['course__duration'],
+                "course_difficulty_level": row['course__difficulty_level'],
+                "course_instructor": full_name(row['course__instructor__first_name'], row['course__instructor__last_name']),
+            },
+            'status': row['status'],
+            'registration_date': self.datetime(row['registration_date']),
+            'grade': _string(row['grade']),
+        }
+
+
+class BulkRegistrationSerializer(serializers.Serializer):
+    MODE_CHOICES = [
+        ('all_or_nothing', 'All or nothing'),
+        ('best_effort', 'Best effort')
+    ]
+
+    student_ids = serializers.ListField(child=serializers.CharField(max_length=15), allow_empty=False, max_length=1000)
+    course_codes = serializers.ListField(child=serializers.CharField(max_length=20), allow_empty=False, max_length=50)
+    mode = serializers.ChoiceField(choices=MODE_CHOICES, default='all_or_nothing')
@@ -0,0 +1,109 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from user.models import StudentProfile
+from .models import Course, Registration
+from .cache import bump_catalog_version
+from .counters import add_pending
+
+
+# Services
+class RegistrationError(Exception):
+    """
+    Raised when a registration cannot be admitted. The message is safe to
+    return to the client.
+    """
+
+
+def register_student(student_profile_id, course):
+    """
+    Register a student for a course in a single transaction.
+
+    The student row is locked for the duration of the transaction, so the
+    duplicate and approved-course checks cannot race with a parallel
+    registration of the same student.
+    """
+    if not course.is_active:
+        raise RegistrationError("This course is not active.")
+
+    try:
+        with transaction.atomic():
+            student = (
+                StudentProfile.objects.select_for_update(of=('self',))
+                .select_related('user').get(pk=student_profile_id)
+            )
+
+            if Registration.objects.filter(student=student, course=course).exists():
+                raise RegistrationError("You are already registered for this course.")
+            if student.approved_count >= Registration.MAX_APPROVED_COURSES:
+                raise RegistrationError("You cannot enroll in more than 2 courses.")
+
+            return Registration.objects.create(student=student, course=course)
+    except IntegrityError:
+        # A registration for the same pair was committed outside of the lock.
+        raise RegistrationError("You are already registered for this course.")
+    except ValidationError as exc:
+        raise RegistrationError(' '.join(exc.messages))
+
+
+def bulk_register(student_ids, course_codes, all_or_nothing=True):
+    """
+    Register every student in `student_ids` for every course in `course_codes`.
+
+    The whole batch is validated with a fixed number of set-based queries and
+    inserted with a single bulk_create. Returns one result per
+    (student_id, course_code) pair, in input order, and whether anything was
+    created. With `all_or_nothing`, a single invalid pair rejects the batch.
+    """
+    student_ids = list(dict.fromkeys(student_ids))
+    course_codes = list(dict.fromkeys(course_codes))
+
+    with transaction.atomic():
+        students = {
+            student.student_id: student
+            for student in StudentProfile.objects.select_for_update(of=('self',))
+            .select_related('user').filter(student_id__in=student_ids)
+        }
+        courses = {
+            course.course_code: course
+            for course in Course.objects.select_related('instructor').filter(course_code__in=course_codes)
+        }
+        existing = set(
+            Registration.objects.filter(student__in=students.values(), course__in=courses.values())
+            .values_list('student_id', 'course_id')
+        )
+
+        results = []
+        pending = []
+        for student_id in student_ids:
+            student = students.get(student_id)
+            for course_code in course_codes:
+                course = courses.get(course_code)
+                result = {'student_id': student_id, 'course_code': course_code}
+                if student is None:
+                    result['error'] = "Student not found."
+                elif course is None:
+                    result['error'] = "Course not found."
+                elif not course.is_active:
+                    result['error'] = "This course is not active."
+                elif (student.pk, course.pk) in existing:
+                    result['error'] = "Student is already registered for this course."
+                elif student.approved_count >= Registration.MAX_APPROVED_COURSES:
+                    result['error'] = "Student cannot enroll in more than 2 courses."
+                else:
+                    result['registration'] = Registration(student=student, course=course)
+                    pending.append(result['registration'])
+                results.append(result)
+
+        has_errors = any('error' in result for result in results)
+        if all_or_nothing and has_errors:
+            for result in results:
+                if result.pop('registration', None) is not None:
+                    result['error'] = "Not created because other items in the batch failed."
+            return results, False
+
+        Registration.objects.bulk_create(pending)
+        add_pending(pending)
+        if pending:
+            transaction.on_commit(bump_catalog_version)
+    return results, bool(pending)
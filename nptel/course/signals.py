@@ -1,15 +1,83 @@
-from django.db.models.signals import pre_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from .models import Course
-import hashlib
+from user.models import FacultyProfile
+from user.identifiers import new_identifier
+from .models import Course, Registration
+from .cache import bump_catalog_version, bump_scope_versions, course_scopes
+from .counters import move_counters
 
 #Signals
 @receiver(pre_save, sender=Course)
-def add_course_code(sender, instance, **kwargs):
+def add_course_code(sender, instance, using, **kwargs):
     """
     Signal to add a course code to every course object.
     """
-    if not instance.course_code:  
-        unique_string = f"{instance.course_name}-{instance.description}"
-        hash_object = hashlib.sha256(unique_string.encode('utf-8'))
-        instance.course_code = f"COURSE-{hash_object.hexdigest()[:8].upper()}"
\ No newline at end of file
+    if not instance.course_code:
+        instance.course_code = new_identifier('course', using=using)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=FacultyProfile)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    """
+    Signal to invalidate the cached catalog once a course or its instructor changes.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(pre_save, sender=Registration)
+def remember_registration_status(sender, instance, **kwargs):
+    """
+    Signal to remember the stored status of a registration before it is saved.
+    Registration.save reads it under a row lock; saves that bypass it, such
+    as fixture loading, fall back to the status loaded with the instance.
+    """
+    if hasattr(instance, '_locked_status'):
+        instance._previous_status = instance._locked_status
+        del instance._locked_status
+    else:
+        instance._previous_status = instance.get_stored_status()
+
+
+def invalidate_course_entries(course):
+    """Invalidate the cached entries that depend on the registrations of `course`, on commit."""
+    transaction.on_commit(partial(bump_scope_versions, *course_scopes(course)))
+
+
+@receiver(post_save, sender=Registration)
+def count_saved_registration(sender, instance, **kwargs):
+    """
+    Signal to update the registration counters after a create or status change.
+    """
+    if instance._previous_status != instance.status:
+        move_counters(instance.course_id, instance.student_id, instance._previous_status, instance.status)
+    # Any save, a grade change included, can change the cached statistics.
+    invalidate_course_entries(instance.course)
+
+
+@receiver(pre_delete, sender=Course)
+def remember_deleted_course(sender, instance, origin=None, **kwargs):
+    """
+    Signal to mark a course as part of the deletion started by `origin`.
+    """
+    if origin is not None:
+        origin._deleted_course_ids = getattr(origin, '_deleted_course_ids', set()) | {instance.pk}
+
+
+@receiver(post_delete, sender=Registration)
+def count_deleted_registration(sender, instance, origin=None, **kwargs):
+    """
+    Signal to update the registration counters after a registration is deleted.
+    """
+    status = instance.__dict__.get('_loaded_status', instance.status)
+    if instance.course_id in getattr(origin, '_deleted_course_ids', ()):
+        # The course goes as well and its deletion bumps the catalog, only
+        # the student's counter is left to move.
+        move_counters(None, instance.student_id, status, None)
+        return
+    move_counters(instance.course_id, instance.student_id, status, None)
+    invalidate_course_entries(instance.course)
@@ -0,0 +1,65 @@
+"""
+Enrollment and grade statistics for faculty dashboards.
+
+Status totals, the grade histogram and registrations over time are all
+derived from a single query grouped by (status, grade, period).
+"""
+from django.db.models import Count
+from django.db.models.functions import Trunc
+
+from .models import Registration
+
+
+PERIODS = ('day', 'week', 'month', 'year')
+
+
+def _empty_totals():
+    return {value: 0 for value, _ in Registration.STATUS_CHOICES}
+
+
+def registration_statistics(registrations, period='month', by_course=False):
+    """
+    Summarise `registrations` with one grouped query.
+
+    With `by_course`, the status totals are also broken down per course.
+    """
+    group = ['status', 'grade', 'period']
+    if by_course:
+        group = ['course__course_code', 'course__course_name'] + group
+    rows = (
+        registrations.order_by()
+        .annotate(period=Trunc('registration_date', period))
+        .values(*group)
+        .annotate(count=Count('id'))
+    )
+
+    total = 0
+    statuses = _empty_totals()
+    grades = {}
+    timeline = {}
+    courses = {}
+    for row in rows:
+        count = row['count']
+        total += count
+        statuses[row['status']] += count
+        if row['grade']:
+            grades[row['grade']] = grades.get(row['grade'], 0) + count
+        day = row['period'].date()
+        timeline[day] = timeline.get(day, 0) + count
+        if by_course:
+            code = row['course__course_code']
+            if code not in courses:
+                courses[code] = {'course_code': code, 'course_name': row['course__course_name'], 'total': 0, 'status': _empty_totals()}
+            courses[code]['total'] += count
+            courses[code]['status'][row['status']] += count
+
+    statistics = {
+        'total': total,
+        'status': statuses,
+        'grades': [{'grade': grade, 'count': grades[grade]} for grade in sorted(grades)],
+        'period': period,
+        'timeline': [{'period': day.isoformat(), 'count': timeline[day]} for day in sorted(timeline)],
+    }
+    if by_course:
+        statistics['courses'] = sorted(courses.values(), key=lambda course: course['course_code'])
+    return statistics
@@ -0,0 +1,97 @@
+"""
+Query budget tests for the course endpoints.
+
+Every listing is called with several rows per page, so a query per row
+shows up as a budget failure. Responses are not cached, each call runs the
+queries of a cache miss.
+"""
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from nptel.querybudget import QueryBudgetMixin
+from user.authentication import revocation_cache
+from user.models import User
+from user.tokens import tokens_for_user
+from .models import Course, Registration
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    JWT_REVOCATION_CACHE_TTL=24 * 60 * 60,
+    REQUEST_SAMPLE_RATE=0,
+)
+class EndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    ROWS = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty_user = User.objects.create_user('budget-faculty', 'Budget-Test-1', account_type='faculty')
+        cls.faculty = faculty_user.faculty_profile
+        cls.courses = [
+            Course.objects.create(
+                course_name=f'Course {i}', description='Budget test', duration=30,
+                difficulty_level=1 + i % 3, instructor=cls.faculty,
+            )
+            for i in range(cls.ROWS + 1)
+        ]
+        cls.students = [
+            User.objects.create_user(f'budget-student-{i}', 'Budget-Test-1').student_profile
+            for i in range(cls.ROWS)
+        ]
+        for student in cls.students:
+            for course in cls.courses[:2]:
+                Registration.objects.create(student=student, course=course)
+
+    def setUp(self):
+        # The revocation list load and the account checks are amortized
+        # over JWT_REVOCATION_CACHE_TTL, do them before measuring.
+        revocation_cache.refresh()
+        for user_id in User.objects.values_list('pk', flat=True):
+            revocation_cache.is_revoked(user_id)
+        self.addCleanup(revocation_cache.clear)
+
+    def client_for(self, profile):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(profile.user, profile)['access']}")
+        return client
+
+    def assertWithinBudget(self, client, method, url_name, kwargs=None, data=None, expected_status=200):
+        with self.assertEndpointQueryBudget(url_name, method):
+            response = getattr(client, method.lower())(reverse(url_name, kwargs=kwargs), data, format='json')
+            if response.streaming:
+                # Streamed bodies run their queries while being consumed.
+                response.getvalue()
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_catalog(self):
+        client = APIClient()
+        response = self.assertWithinBudget(client, 'GET', 'course-list-all', data={'facets': 'true', 'page_size': 3})
+        next_page = {name: values[0] for name, values in parse_qs(urlparse(response.data['next']).query).items()}
+        self.assertWithinBudget(client, 'GET', 'course-list-all', data=next_page)
+        self.assertWithinBudget(client, 'GET', 'course-list-all', data={'ordering': 'difficulty_level'})
+        self.assertWithinBudget(client, 'GET', 'course-search', data={'q': 'course'})
+
+    def test_faculty_reads(self):
+        client = self.client_for(self.faculty)
+        detail = {'course_code': self.courses[0].course_code}
+        self.assertWithinBudget(client, 'GET', 'course-list-create')
+        self.assertWithinBudget(client, 'GET', 'course-detail', kwargs=detail)
+        self.assertWithinBudget(client, 'GET', 'course-registrations', kwargs=detail)
+        self.assertWithinBudget(client, 'GET', 'course-roster', kwargs=detail)
+        self.assertWithinBudget(client, 'GET', 'course-statistics', kwargs=detail)
+        self.assertWithinBudget(client, 'GET', 'faculty-statistics')
+
+    def test_student_registrations(self):
+        client = self.client_for(self.students[0])
+        response = self.assertWithinBudget(client, 'GET', 'student-registrations')
+        self.assertEqual(len(response.data['results']), 2)
+        client.credentials(**client._credentials, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertWithinBudget(client, 'GET', 'student-registrations', expected_status=304)
+
+    def test_register(self):
+        course = {'course_code': self.courses[-1].course_code}
+        self.assertWithinBudget(self.client_for(self.students[0]), 'POST', 'course-register', kwargs=course, expected_status=201)
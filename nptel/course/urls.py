@@ -5,7 +5,14 @@ from . import views
 # URLs
 urlpatterns = [
     path('all-courses/', views.CourseListAPIView.as_view(), name='course-list-all'),
+    path('search/', views.CourseSearchAPIView.as_view(), name='course-search'),
     path('faculty-courses/', views.CourseListCreateAPIView.as_view(), name='course-list-create'),
+    path('faculty-courses/statistics/', views.FacultyStatisticsAPIView.as_view(), name='faculty-statistics'),
     path('courses/<str:course_code>/', views.CourseDetailAPIView.as_view(), name='course-detail'),
+    path('courses/<str:course_code>/registrations/', views.CourseRegistrationListAPIView.as_view(), name='course-registrations'),
+    path('courses/<str:course_code>/roster/', views.CourseRosterExportAPIView.as_view(), name='course-roster'),
+    path('courses/<str:course_code>/statistics/', views.CourseStatisticsAPIView.as_view(), name='course-statistics'),
+    path('my-registrations/', views.StudentRegistrationListAPIView.as_view(), name='student-registrations'),
+    path('register/bulk/', views.BulkRegistrationAPIView.as_view(), name='course-register-bulk'),
     path('register/<str:course_code>', views.CourseRegistrationAPIView.as_view(), name='course-register'),
 ]
\ No newline at end of file
@@ -1,22 +1,34 @@
+import hashlib
+
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.shortcuts import get_object_or_404
 from .models import Course, Registration
-from user.models import FacultyProfile, StudentProfile
-from .serializers import CourseCreateSerializer, CourseDetailSerializer, RegistrationSerializer
+from nptel.http import accepts_encoding
+from user.permissions import IsFaculty, IsStudent, get_faculty_profile_id, get_student_profile_id
+from .serializers import (
+    CourseCreateSerializer, CourseDetailSerializer, RegistrationSerializer, BulkRegistrationSerializer,
+    CourseDetailValuesSerializer, RegistrationValuesSerializer,
+)
+from .pagination import CourseCursorPagination, RegistrationCursorPagination, SearchCursorPagination
+from .services import RegistrationError, register_student, bulk_register
+from .search import search_courses
+from .filters import CourseCatalogFilter, CourseOrderingFilter, RegistrationStatusFilter, course_facets
+from .export import EXPORT_FORMATS, export_roster
+from .statistics import PERIODS, registration_statistics
+from . import cache
 
 
 # Views
-class IsFaculty(permissions.BasePermission):
-    def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and FacultyProfile.objects.filter(user=request.user).exists())
-
-
 class CourseListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = CourseCreateSerializer
     permission_classes = [IsFaculty]
+    pagination_class = CourseCursorPagination
 
     @extend_schema(
         summary="List courses of the faculty",
@@ -25,8 +37,8 @@ class CourseListCreateAPIView(generics.ListCreateAPIView):
         """
         Retrieve a list of courses created by the faculty.
         """
-        faculty_profile = request.user.faculty_profile
-        courses = Course.objects.filter(instructor=faculty_profile)
+        faculty_profile_id = get_faculty_profile_id(request)
+        courses = Course.objects.filter(instructor_id=faculty_profile_id).select_related('instructor')
 
         page = self.paginate_queryset(courses)
         if page is not None:
@@ -43,10 +55,10 @@ class CourseListCreateAPIView(generics.ListCreateAPIView):
         """
         Create a new course.
         """
-        faculty_profile = request.user.faculty_profile
+        faculty_profile_id = get_faculty_profile_id(request)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(instructor=faculty_profile)
+        serializer.save(instructor_id=faculty_profile_id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -63,10 +75,16 @@ class CourseDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         Retrieve a specific course using its course code.
         """
         course_code = kwargs.get('course_code')  
-        faculty_profile = request.user.faculty_profile  
-        course = get_object_or_404(Course, course_code=course_code, instructor=faculty_profile)  
-        serializer = self.get_serializer(course)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        faculty_profile_id = get_faculty_profile_id(request)
+
+        def build():
+            course = get_object_or_404(Course.objects.select_related('instructor'), course_code=course_code)
+            return self.get_serializer(course).data
+
+        payload = cache.course_payload(course_code, build)
+        if payload['instructor'] != faculty_profile_id:
+            raise Http404
+        return Response(payload, status=status.HTTP_200_OK)
 
     @extend_schema(
         summary="Update a course - Full Update",
@@ -76,11 +94,11 @@ class CourseDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         """
         Update a specific course using its course code."""
         course_code = kwargs.get('course_code')  
-        faculty_profile = request.user.faculty_profile  
-        course = get_object_or_404(Course, course_code=course_code, instructor=faculty_profile)  
+        faculty_profile_id = get_faculty_profile_id(request)
+        course = get_object_or_404(Course.objects.select_related('instructor'), course_code=course_code, instructor_id=faculty_profile_id)
         serializer = self.get_serializer(course, data=request.data)  
         serializer.is_valid(raise_exception=True)
-        serializer.save(instructor=faculty_profile)  
+        serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -92,8 +110,8 @@ class CourseDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         Delete a specific course using its course code.
         """
         course_code = kwargs.get('course_code')  
-        faculty_profile = request.user.faculty_profile  
-        course = get_object_or_404(Course, course_code=course_code, instructor=faculty_profile)  
+        faculty_profile_id = get_faculty_profile_id(request)
+        course = get_object_or_404(Course.objects.select_related('instructor'), course_code=course_code, instructor_id=faculty_profile_id)
         course.delete()  
         return Response(
             {"message": "Course deleted successfully."},
@@ -109,18 +127,14 @@ class CourseDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         Update a specific course using its course code.
         """
         course_code = kwargs.get('course_code')  
-        faculty_profile = request.user.faculty_profile  
-        course = get_object_or_404(Course, course_code=course_code, instructor=faculty_profile)  
+        faculty_profile_id = get_faculty_profile_id(request)
+        course = get_object_or_404(Course.objects.select_related('instructor'), course_code=course_code, instructor_id=faculty_profile_id)
         serializer = self.get_serializer(course, data=request.data, partial=True)  
         serializer.is_valid(raise_exception=True)
-        serializer.save(instructor=faculty_profile)  
+        serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
     
 
-class IsStudent(permissions.BasePermission):
-    def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and StudentProfile.objects.filter(user=request.user).exists())
-
 class CourseRegistrationAPIView(generics.CreateAPIView):
     serializer_class = RegistrationSerializer
     permission_classes = [IsStudent]
@@ -133,42 +147,314 @@ class CourseRegistrationAPIView(generics.CreateAPIView):
         Register for a specific course using its course code.
         """
         course_code = kwargs.get('course_code')
-        course = get_object_or_404(Course, course_code=course_code)
+        course = get_object_or_404(Course.objects.select_related('instructor'), course_code=course_code)
+        student_profile_id = get_student_profile_id(request)
+
+        try:
+            registration = register_student(student_profile_id, course)
+        except RegistrationError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(registration)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+
+class CourseRegistrationListAPIView(generics.ListAPIView):
+    serializer_class = RegistrationSerializer
+    permission_classes = [IsFaculty]
+    pagination_class = RegistrationCursorPagination
+    filter_backends = [RegistrationStatusFilter]
+
+    @extend_schema(
+        summary="List the registrations of a course",
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieve the registrations of a course of the faculty, newest first.
+        """
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        course = get_object_or_404(
+            Course.objects.only('id'),
+            course_code=self.kwargs.get('course_code'), instructor_id=get_faculty_profile_id(self.request)
+        )
+        return Registration.objects.filter(course=course)
+
+    def list(self, request, *args, **kwargs):
+        registrations = RegistrationValuesSerializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(registrations)
+        if page is not None:
+            return self.get_paginated_response(RegistrationValuesSerializer(page).data)
+        return Response(RegistrationValuesSerializer(registrations).data)
+
+
+def registration_etag(request, registrations):
+    """
+    ETag of a registration listing, from a single aggregate over
+    `registrations`. It changes whenever a registration is added, changed or
+    removed, or a course, student or instructor shown in the list is updated.
+    """
+    state = registrations.aggregate(
+        count=Count('id'), updated=Max('updated_at'), course_updated=Max('course__updated_at'),
+        instructor_updated=Max('course__instructor__modified_at'),
+        student_updated=Max('student__modified_at'), user_updated=Max('student__user__modified_at'),
+    )
+    key = ':'.join(str(value) for value in [request.get_full_path(), *state.values()])
+    return '"{}"'.format(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+
+class StudentRegistrationListAPIView(generics.ListAPIView):
+    serializer_class = RegistrationSerializer
+    permission_classes = [IsStudent]
+    pagination_class = RegistrationCursorPagination
+    filter_backends = [RegistrationStatusFilter]
+
+    @extend_schema(
+        summary="List the registrations of the student",
+        description=(
+            "Registrations of the authenticated student, newest first. Responses carry an ETag; "
+            "send it back as If-None-Match to get a 304 while the list is unchanged."
+        ),
+        responses={200: RegistrationSerializer(many=True), 304: OpenApiResponse(description="Not modified")},
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieve the registrations of the student, newest first.
+        """
+        registrations = self.filter_queryset(self.get_queryset())
+        # No Last-Modified: the newest timestamp goes back when a
+        # registration is deleted, and the count in the ETag catches that.
+        etag = registration_etag(request, registrations)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            rows = RegistrationValuesSerializer.values(registrations)
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                response = self.get_paginated_response(RegistrationValuesSerializer(page).data)
+            else:
+                response = Response(RegistrationValuesSerializer(rows).data)
+
+        response['ETag'] = etag
+        # Only the student's own client may reuse the list, after revalidating.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+        return response
 
-        if not course.is_active:
-            return Response({"detail": "This course is not active."}, status=status.HTTP_400_BAD_REQUEST)
+    def get_queryset(self):
+        return Registration.objects.filter(student_id=get_student_profile_id(self.request))
+
+
+class CourseRosterExportAPIView(generics.GenericAPIView):
+    permission_classes = [IsFaculty]
+    filter_backends = [RegistrationStatusFilter]
+
+    @extend_schema(
+        summary="Export the registration roster of a course",
+        description=(
+            "Streams every registration of the course as CSV or NDJSON. The response is gzip "
+            "compressed when the client's `Accept-Encoding` allows gzip."
+        ),
+        parameters=[
+            OpenApiParameter('export_format', str, enum=list(EXPORT_FORMATS), description="csv (default) or ndjson."),
+            OpenApiParameter('status', str, description="Comma separated registration statuses to include."),
+        ],
+        responses={(200, 'text/csv'): OpenApiResponse(description="Roster file")},
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Stream the registration roster of a course of the faculty.
+        """
+        course = get_object_or_404(
+            Course.objects.only('id', 'course_code'),
+            course_code=kwargs.get('course_code'), instructor_id=get_faculty_profile_id(request)
+        )
+
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'detail': f"export_format must be one of {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        registrations = self.filter_queryset(Registration.objects.filter(course=course))
+        gzip = accepts_encoding(request, 'gzip')
+        response = StreamingHttpResponse(
+            export_roster(registrations, export_format, gzip=gzip),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{course.course_code}-roster.{export_format}"'
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
 
-        student_profile = request.user.student_profile
 
-        if Registration.objects.filter(student=student_profile, course=course).exists():
-            return Response({"detail": "You are already registered for this course."}, status=status.HTTP_400_BAD_REQUEST)
+STATISTICS_PARAMETERS = [
+    OpenApiParameter('period', str, enum=list(PERIODS), description="Bucket size of the timeline, month by default."),
+    OpenApiParameter('cached', bool, description="Serve a cached rollup, invalidated whenever a course or registration changes."),
+]
 
-        approved_courses_count = student_profile.registrations.filter(status='approved').count()
-        if approved_courses_count >= 2:
-            return Response({"detail": "You cannot enroll in more than 2 courses."}, status=status.HTTP_400_BAD_REQUEST)
 
+def statistics_options(request):
+    """Return the requested timeline period and whether to use the cached rollup."""
+    period = request.query_params.get('period', 'month')
+    if period not in PERIODS:
+        raise ValidationError({'period': f"Expected one of {', '.join(PERIODS)}."})
+    cached = request.query_params.get('cached', '').lower() in ('true', '1')
+    return period, cached
+
+
+class CourseStatisticsAPIView(generics.GenericAPIView):
+    permission_classes = [IsFaculty]
+
+    @extend_schema(
+        summary="Enrollment and grade statistics of a course",
+        description="Registrations per status, grade histogram and registrations over time.",
+        parameters=STATISTICS_PARAMETERS,
+        responses={200: OpenApiResponse(description="Registration statistics of the course")},
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieve the registration statistics of a course of the faculty.
+        """
+        period, cached = statistics_options(request)
+        course = get_object_or_404(
+            Course.objects.only('id', 'course_code'),
+            course_code=kwargs.get('course_code'), instructor_id=get_faculty_profile_id(request)
+        )
+
+        def build():
+            statistics = registration_statistics(Registration.objects.filter(course=course), period)
+            return {'course_code': course.course_code, **statistics}
+
+        if cached:
+            key = cache.make_key('statistics', course.course_code, period, scopes=[f"course:{course.course_code}"])
+            return Response(cache.get_or_build(key, build))
+        return Response(build())
+
+
+class FacultyStatisticsAPIView(generics.GenericAPIView):
+    permission_classes = [IsFaculty]
+
+    @extend_schema(
+        summary="Enrollment and grade statistics of all courses of the faculty",
+        description=(
+            "Registrations per status, grade histogram and registrations over time across every "
+            "course of the faculty, with status totals per course that has registrations."
+        ),
+        parameters=STATISTICS_PARAMETERS,
+        responses={200: OpenApiResponse(description="Registration statistics of all courses of the faculty")},
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieve the registration statistics of all courses of the faculty.
+        """
+        period, cached = statistics_options(request)
+        faculty_profile_id = get_faculty_profile_id(request)
+
+        def build():
+            registrations = Registration.objects.filter(course__instructor_id=faculty_profile_id)
+            return registration_statistics(registrations, period, by_course=True)
+
+        if cached:
+            key = cache.make_key('statistics', 'faculty', faculty_profile_id, period, scopes=[f"faculty:{faculty_profile_id}"])
+            return Response(cache.get_or_build(key, build))
+        return Response(build())
+
+
+class BulkRegistrationAPIView(generics.GenericAPIView):
+    serializer_class = BulkRegistrationSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary="Register a batch of students for a batch of courses",
+        description=(
+            "Registers every listed student for every listed course. In `all_or_nothing` mode a "
+            "single invalid pair rejects the whole batch, in `best_effort` mode valid pairs are "
+            "registered and invalid ones are reported."
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Register a batch of students for a batch of courses.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        serializer.save(student=student_profile, course=course)
+        results, created = bulk_register(
+            serializer.validated_data['student_ids'],
+            serializer.validated_data['course_codes'],
+            all_or_nothing=serializer.validated_data['mode'] == 'all_or_nothing',
+        )
+
+        registrations = [result['registration'] for result in results if 'registration' in result]
+        registration_data = iter(RegistrationSerializer(registrations, many=True).data)
+        items = []
+        for result in results:
+            item = {'student_id': result['student_id'], 'course_code': result['course_code']}
+            if 'registration' in result:
+                item['status'] = 'created'
+                item['registration'] = next(registration_data)
+            else:
+                item['status'] = 'failed'
+                item['detail'] = result['error']
+            items.append(item)
+
+        return Response(
+            {'created': len(registrations), 'failed': len(items) - len(registrations), 'results': items},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        )
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
 
 class CourseListAPIView(generics.ListAPIView):
     serializer_class = CourseDetailSerializer
     permission_classes = [permissions.AllowAny]
-    pagination_class = PageNumberPagination  
+    pagination_class = CourseCursorPagination
+    filter_backends = [CourseCatalogFilter, CourseOrderingFilter]
 
     @extend_schema(
         summary="List all courses",
+        parameters=[OpenApiParameter('facets', bool, description="Include course counts per difficulty level and department.")],
         responses={200: CourseDetailSerializer(many=True)}
     )
     def get(self, request, *args, **kwargs):
         """
         Retrieve all available courses.
         """
-        courses = Course.objects.all()
+        def build():
+            courses = self.filter_queryset(Course.objects.all())
+            rows = CourseDetailValuesSerializer.values(courses)
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                data = self.get_paginated_response(CourseDetailValuesSerializer(page).data).data
+                if request.query_params.get('facets', '').lower() in ('1', 'true'):
+                    data['facets'] = course_facets(courses)
+                return data
+            return CourseDetailValuesSerializer(rows).data
+
+        return Response(cache.catalog_page(request, build), status=status.HTTP_200_OK)
+
+
+class CourseSearchAPIView(generics.ListAPIView):
+    serializer_class = CourseDetailSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = SearchCursorPagination
+    filter_backends = [CourseCatalogFilter]
+
+    @extend_schema(
+        summary="Search courses",
+        description="Ranked search over course name, description and course code. Partial course codes match as a prefix.",
+        parameters=[OpenApiParameter('q', str, required=True, description="Search terms.")],
+        responses={200: CourseDetailSerializer(many=True)}
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Search the course catalog.
+        """
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({"detail": "The q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        courses = search_courses(self.filter_queryset(Course.objects.select_related('instructor')), term)
         page = self.paginate_queryset(courses)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn.conf.py nptel.wsgi:application   # WSGI, threaded workers
+    gunicorn -c gunicorn.conf.py nptel.asgi:application   # ASGI, uvicorn workers
+
+The worker class follows the application unless GUNICORN_WORKER_CLASS is set.
+WSGI is the production default. Under ASGI every synchronous DRF view of a
+worker runs on one shared thread, so writes and logins are handled one at a
+time per worker, and the streamed roster export is buffered in memory.
+"""
+import os
+import sys
+
+
+asgi = any(arg.endswith('asgi:application') for arg in sys.argv)
+cpus = os.cpu_count() or 1
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker' if asgi else 'gthread')
+# An event loop keeps one core busy on its own, threaded workers wait on I/O.
+workers = int(os.environ.get('GUNICORN_WORKERS', cpus if asgi else cpus * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+backlog = int(os.environ.get('GUNICORN_BACKLOG', 2048))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then to contain slow memory growth.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
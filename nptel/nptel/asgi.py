@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nptel.settings")
+# Serve the read-only course endpoints with async views.
+os.environ.setdefault("ROOT_URLCONF", "nptel.asgi_urls")
+# Django does not support persistent connections under ASGI, set DB_POOL to
+# reuse connections instead.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
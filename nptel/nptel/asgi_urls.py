@@ -0,0 +1,18 @@
+"""
+URL configuration of the ASGI deployment.
+
+Identical to nptel/urls.py, except that the read-heavy course endpoints are
+served by the async views in course/async_views.py. Selected through the
+ROOT_URLCONF environment variable, which nptel/asgi.py sets.
+"""
+from django.urls import path
+
+from course import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+
+urlpatterns = [
+    path('course/all-courses/', async_views.course_list, name='course-list-all'),
+    path('course/courses/<str:course_code>/', async_views.course_detail, name='course-detail'),
+    path('course/courses/<str:course_code>/registrations/', async_views.course_registrations, name='course-registrations'),
+] + sync_urlpatterns
@@ -0,0 +1,111 @@
+"""
+Database connection statistics.
+
+Connections are reused either as persistent connections (CONN_MAX_AGE) or
+through a psycopg 3 pool per process (DB_POOL), see DATABASES in
+settings.py. `connection_stats` reports what the current process holds:
+the reuse mode, how many connections it opened and, for a pool, the
+connections in use, idle and the time requests waited for one.
+
+Every gunicorn worker has its own connections, so the numbers describe the
+worker that answered.
+"""
+import os
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+_lock = threading.Lock()
+_opened = Counter()
+
+
+def _count_connection(sender, connection, **kwargs):
+    with _lock:
+        _opened[connection.alias] += 1
+
+
+connection_created.connect(_count_connection, dispatch_uid='nptel.db.count_connection')
+
+
+def connection_mode(connection):
+    """'pool', 'persistent' or 'per-request'."""
+    if connection.settings_dict['OPTIONS'].get('pool'):
+        return 'pool'
+    return 'per-request' if connection.settings_dict['CONN_MAX_AGE'] == 0 else 'persistent'
+
+
+def pool_stats(pool):
+    """Summary of psycopg_pool statistics; counters are since the pool opened."""
+    stats = pool.get_stats()
+    queued = stats.get('requests_queued', 0)
+    opened = stats.get('connections_num', 0)
+    return {
+        'min_size': stats.get('pool_min', 0),
+        'max_size': stats.get('pool_max', 0),
+        'size': stats.get('pool_size', 0),
+        'in_use': stats.get('pool_size', 0) - stats.get('pool_available', 0),
+        'idle': stats.get('pool_available', 0),
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'requests_waited': queued,
+        'wait_ms_total': stats.get('requests_wait_ms', 0),
+        'wait_ms_avg': round(stats.get('requests_wait_ms', 0) / queued, 2) if queued else 0.0,
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_opened': opened,
+        'connect_ms_avg': round(stats.get('connections_ms', 0) / opened, 2) if opened else 0.0,
+        'connections_lost': stats.get('connections_lost', 0),
+    }
+
+
+def connection_stats(alias):
+    """Connection statistics of one database alias in this process."""
+    connection = connections[alias]
+    mode = connection_mode(connection)
+    with _lock:
+        # Connections taken from the pool count as opened here, the pool
+        # statistics have the physical connections.
+        opened = _opened[alias]
+    return {
+        'vendor': connection.vendor,
+        'mode': mode,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        'connections_opened': opened,
+        'pool': pool_stats(connection.pool) if mode == 'pool' else None,
+    }
+
+
+def database_stats():
+    return {
+        'pid': os.getpid(),
+        'databases': {alias: connection_stats(alias) for alias in connections},
+    }
+
+
+class DatabaseStatsView(APIView):
+    # The staff flag is not part of the token claims, load the user row.
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary="Database Connection Statistics",
+        description=(
+            "Connection reuse mode and connection counts of every database in the worker process that "
+            "answered. With DB_POOL on, also the pool size, connections in use and idle, requests "
+            "waiting and the time spent waiting for a connection."
+        ),
+        responses={200: OpenApiResponse(description="Connection statistics per database alias")},
+    )
+    def get(self, request):
+        """
+        Returns the connection statistics of this worker process.
+        """
+        return Response(database_stats())
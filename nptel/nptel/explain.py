@@ -0,0 +1,66 @@
+"""
+Query plans.
+
+`explain` runs a statement under `EXPLAIN (ANALYZE)` on PostgreSQL and
+`EXPLAIN QUERY PLAN` on SQLite and returns the tables it reads in full
+and how long it took. SQLite has no ANALYZE variant, so the statement is
+executed once more to time it.
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+@dataclass
+class Plan:
+    sql: str
+    duration: float
+    full_scans: list = field(default_factory=list)
+    text: str = ''
+
+
+def explain(sql, params=None, using=DEFAULT_DB_ALIAS):
+    """Return the Plan of a SELECT statement, running it once."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return _explain_postgresql(connection, sql, params)
+    if connection.vendor == 'sqlite':
+        return _explain_sqlite(connection, sql, params)
+    raise NotImplementedError(f"Query plans are not supported on {connection.vendor}.")
+
+
+def _explain_postgresql(connection, sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+        result = cursor.fetchone()[0]
+        cursor.execute(f'EXPLAIN (ANALYZE) {sql}', params)
+        text = '\n'.join(row[0] for row in cursor.fetchall())
+    plan = result[0]
+
+    full_scans = []
+    nodes = [plan['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            full_scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return Plan(sql, plan['Execution Time'], full_scans, text)
+
+
+def _explain_sqlite(connection, sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        details = [row[3] for row in cursor.fetchall()]
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        duration = (time.perf_counter() - started) * 1000
+
+    # "SCAN course_course" reads every row, "SCAN course_course USING
+    # INDEX ..." walks an index in order and "SEARCH ..." is a lookup.
+    full_scans = [
+        detail.split()[1] for detail in details
+        if detail.startswith('SCAN ') and ' USING ' not in detail
+    ]
+    return Plan(sql, duration, full_scans, '\n'.join(details))
@@ -0,0 +1,30 @@
+"""
+Content negotiation helpers shared by the views that compress their own
+responses.
+"""
+
+
+def accepts_encoding(request, encoding):
+    """
+    Whether the Accept-Encoding header of `request` allows `encoding`.
+
+    Quality values are honoured, so `gzip;q=0` refuses gzip, and `*` covers
+    every encoding the header does not name.
+    """
+    wildcard = False
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.strip().lower()
+        if coding == encoding:
+            return quality > 0
+        if coding == '*':
+            wildcard = quality > 0
+    return wildcard
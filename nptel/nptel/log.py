@@ -0,0 +1,25 @@
+"""
+Log formatting.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger and message, plus the
+    fields of the `data` dict passed as `extra={'data': {...}}`.
+    """
+
+    def format(self, record):
+        line = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **getattr(record, 'data', {}),
+        }
+        if record.exc_info:
+            line['exception'] = self.formatException(record.exc_info)
+        return json.dumps(line, default=str)
@@ -0,0 +1,196 @@
+"""
+Project middleware.
+"""
+import heapq
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from .routers import REPLICA_VIEWS, apin_to_primary, ais_pinned, is_pinned, pin_to_primary, replica_reads
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger('nptel.requests')
+
+# Statements listed as the slowest of a request, and the length they are cut to.
+SLOWEST_QUERIES = 3
+LOGGED_SQL_LENGTH = 300
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that counts queries, sums their time, keeps
+    the slowest and counts repeats of the same statement. Statements are
+    compared with their parameter placeholders, so an N+1 loop shows up as
+    one statement run N times.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.statements[sql] += 1
+            entry = (elapsed, self.count, sql)
+            if len(self.slowest) < SLOWEST_QUERIES:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Measure requests: total time, query count and SQL time, the slowest
+    statements and repeated statements.
+
+    Queries are only recorded for a random REQUEST_SAMPLE_RATE share of
+    requests; the others just get timed. Recorded requests are logged to
+    `nptel.requests` at INFO, or WARNING when they repeat a statement
+    DUPLICATE_QUERY_THRESHOLD times. Any request slower than SLOW_REQUEST_MS
+    is logged at WARNING, sampled or not. With SERVER_TIMING on, the timings
+    are returned in a Server-Timing header.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder() if random.random() < settings.REQUEST_SAMPLE_RATE else None
+        started = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        self.report(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder() if random.random() < settings.REQUEST_SAMPLE_RATE else None
+        started = time.perf_counter()
+        if recorder is None:
+            response = await self.get_response(request)
+        else:
+            # Connections are per thread: install the wrappers in the thread
+            # that runs this request's sync code and database queries.
+            recording = await sync_to_async(self.recording)(recorder)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(recording.close)()
+        self.report(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    def recording(self, recorder):
+        """Record the queries of all databases until the returned stack is closed."""
+        stack = ExitStack()
+        if recorder is not None:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return stack
+
+    def report(self, request, response, recorder, elapsed):
+        total_ms = elapsed * 1000
+        timings = [f'total;dur={total_ms:.1f}']
+        slow = total_ms >= settings.SLOW_REQUEST_MS
+        data = {
+            'method': request.method,
+            'path': request.path,
+            'view': request.resolver_match.view_name if request.resolver_match else None,
+            'status': response.status_code,
+            'duration_ms': round(total_ms, 2),
+            'slow': slow,
+            'sampled': recorder is not None,
+        }
+        duplicates = []
+        if recorder is not None:
+            db_ms = recorder.duration * 1000
+            duplicates = recorder.duplicates(settings.DUPLICATE_QUERY_THRESHOLD)
+            timings[:0] = [
+                f'db;desc="{recorder.count} queries";dur={db_ms:.1f}',
+                f'app;dur={total_ms - db_ms:.1f}',
+            ]
+            data.update({
+                'queries': recorder.count,
+                'db_ms': round(db_ms, 2),
+                'slowest': [
+                    {'ms': round(duration * 1000, 2), 'sql': sql[:LOGGED_SQL_LENGTH]}
+                    for duration, _, sql in sorted(recorder.slowest, reverse=True)
+                ],
+                'duplicates': [{'count': count, 'sql': sql[:LOGGED_SQL_LENGTH]} for sql, count in duplicates],
+            })
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join(timings)
+        if slow or duplicates:
+            reason = 'slow request' if slow else 'repeated queries'
+            logger.warning('%s %s: %s', request.method, request.path, reason, extra={'data': data})
+        elif recorder is not None:
+            logger.info('%s %s', request.method, request.path, extra={'data': data})
+
+
+class ReplicaMiddleware:
+    """
+    Route the reads of safe requests to the views in REPLICA_VIEWS to a
+    replica, and pin clients to the primary after a successful write. See
+    nptel/routers.py.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_reads(self.replica_view(request) and not is_pinned(request)):
+            response = self.get_response(request)
+        if self.wrote(request, response):
+            pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        with replica_reads(self.replica_view(request) and not await ais_pinned(request)):
+            response = await self.get_response(request)
+        if self.wrote(request, response):
+            await apin_to_primary(request, response)
+        return response
+
+    def replica_view(self, request):
+        if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+            return False
+        try:
+            return resolve(request.path_info).url_name in REPLICA_VIEWS
+        except Resolver404:
+            return False
+
+    def wrote(self, request, response):
+        return bool(settings.DATABASE_REPLICAS) and request.method not in SAFE_METHODS and response.status_code < 400
@@ -0,0 +1,93 @@
+"""
+Query budgets for API endpoints.
+
+Every endpoint gets a fixed maximum number of SQL queries per request. The
+budget must not depend on the number of rows returned, so an N+1 regression
+shows up as soon as a page contains more than one object.
+"""
+from contextlib import contextmanager
+
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.test.utils import CaptureQueriesContext
+
+
+# Maximum queries per request, keyed by URL name and HTTP method.
+QUERY_BUDGETS = {
+    ('course-list-all', 'GET'): 2,
+    ('course-search', 'GET'): 2,
+    ('course-list-create', 'GET'): 2,
+    ('course-list-create', 'POST'): 4,
+    ('course-detail', 'GET'): 2,
+    ('course-detail', 'PUT'): 3,
+    ('course-detail', 'PATCH'): 3,
+    ('course-detail', 'DELETE'): 8,
+    ('course-registrations', 'GET'): 2,
+    ('student-registrations', 'GET'): 2,
+    ('course-roster', 'GET'): 2,
+    ('course-statistics', 'GET'): 2,
+    ('faculty-statistics', 'GET'): 1,
+    ('course-register', 'POST'): 8,
+    ('course-register-bulk', 'POST'): 8,
+    ('faculty-login', 'POST'): 2,
+    ('student-login', 'POST'): 2,
+    ('student-register', 'POST'): 8,
+    ('faculty-register', 'POST'): 8,
+    # Per batch of ACCOUNT_IMPORT_BATCH_SIZE rows.
+    ('account-import', 'POST'): 9,
+    ('database-stats', 'GET'): 1,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block of code runs more queries than its budget allows."""
+
+    def __init__(self, label, budget, queries):
+        self.label = label
+        self.budget = budget
+        self.queries = queries
+        lines = '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(queries, start=1))
+        super().__init__(f"{label} ran {len(queries)} queries, budget is {budget}:\n{lines}")
+
+
+@contextmanager
+def query_budget(budget, label='Block', using=DEFAULT_DB_ALIAS):
+    """
+    Fail with QueryBudgetExceeded if the wrapped block runs more than
+    `budget` queries on the `using` database.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > budget:
+        raise QueryBudgetExceeded(label, budget, context.captured_queries)
+
+
+def endpoint_budget(url_name, method):
+    """Return the query budget registered for an endpoint."""
+    try:
+        return QUERY_BUDGETS[(url_name, method.upper())]
+    except KeyError:
+        raise KeyError(f"No query budget registered for {method.upper()} {url_name}.")
+
+
+@contextmanager
+def endpoint_query_budget(url_name, method, using=DEFAULT_DB_ALIAS):
+    """Apply the registered budget of an endpoint to the wrapped block."""
+    budget = endpoint_budget(url_name, method)
+    with query_budget(budget, label=f"{method.upper()} {url_name}", using=using) as context:
+        yield context
+
+
+
+class QueryBudgetMixin:
+    """
+    Mixin for Django test cases.
+
+        with self.assertEndpointQueryBudget('course-list-all', 'GET'):
+            self.client.get(reverse('course-list-all'))
+    """
+
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        return query_budget(budget, label=self.id(), using=using)
+
+    def assertEndpointQueryBudget(self, url_name, method, using=DEFAULT_DB_ALIAS):
+        return endpoint_query_budget(url_name, method, using=using)
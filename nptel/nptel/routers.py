@@ -0,0 +1,152 @@
+"""
+Read replica routing.
+
+Replicas are configured with DB_REPLICA_HOSTS and DB_REPLICA_NAMES and
+become the database aliases `replica1`, `replica2`, ... (see settings.py).
+Queries only go to a replica inside `replica_reads()`, which
+`ReplicaMiddleware` enters for read-only requests to the views in
+REPLICA_VIEWS. Every other query, and every write, uses the primary.
+
+Replicas lag behind the primary, so a client that wrote something is
+pinned to the primary for DB_REPLICA_PIN_SECONDS and reads its own writes:
+by a cookie, and for JWT clients by user id in the cache.
+
+To try it locally, copy the SQLite database and point a replica at the
+copy; writes will not show up in it, which is the worst case of lag:
+
+    cp db.sqlite3 replica.sqlite3
+    DB_REPLICA_NAMES=replica.sqlite3 python manage.py runserver
+"""
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+import jwt
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings
+
+
+# URL names of the views whose safe requests read from a replica.
+REPLICA_VIEWS = frozenset([
+    'course-list-all',
+    'course-search',
+    'course-list-create',
+    'course-detail',
+    'course-registrations',
+    'student-registrations',
+    'course-roster',
+    'course-statistics',
+    'faculty-statistics',
+])
+
+PIN_COOKIE = 'primary_pin'
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Send the reads of the wrapped block to a replica, if there is one."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reading_from_replica():
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def _pin_key(user_id):
+    return f'replica:pin:{user_id}'
+
+
+def token_user_id(request):
+    """
+    User id claim of the bearer token, without verifying it. Only used to
+    pick a database, never for authorization.
+    """
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        payload = jwt.decode(parts[1], options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get(api_settings.USER_ID_CLAIM)
+
+
+def _cookie_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_pinned(request):
+    """Whether the client wrote within the last DB_REPLICA_PIN_SECONDS."""
+    if _cookie_pinned(request):
+        return True
+    user_id = token_user_id(request)
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+async def ais_pinned(request):
+    if _cookie_pinned(request):
+        return True
+    user_id = token_user_id(request)
+    return user_id is not None and await cache.aget(_pin_key(user_id)) is not None
+
+
+def _pin_cookie(response):
+    window = settings.DB_REPLICA_PIN_SECONDS
+    response.set_cookie(PIN_COOKIE, f'{time.time() + window:.3f}', max_age=window, httponly=True, samesite='Lax')
+
+
+def _written_user_id(request):
+    # DRF sets the authenticated user on the Django request as well.
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return token_user_id(request)
+
+
+def pin_to_primary(request, response):
+    """Read from the primary for the next DB_REPLICA_PIN_SECONDS."""
+    _pin_cookie(response)
+    user_id = _written_user_id(request)
+    if user_id is not None:
+        cache.set(_pin_key(user_id), 1, settings.DB_REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(request, response):
+    _pin_cookie(response)
+    # request.user may still be a lazy object that queries the database.
+    user_id = await sync_to_async(_written_user_id)(request)
+    if user_id is not None:
+        await cache.aset(_pin_key(user_id), 1, settings.DB_REPLICA_PIN_SECONDS)
@@ -0,0 +1,156 @@
+"""
+Prebuilt OpenAPI schema.
+
+`manage.py build_schema` renders the schema once, as YAML and JSON, and
+stores each file in SCHEMA_DIR together with a gzip copy and its ETag.
+`StoredSchemaView` serves those files from memory, answering conditional
+requests with 304 and gzip-capable clients with the compressed copy, so
+requests for the schema never run the generator.
+
+Without DEBUG the stored files are served unconditionally. With DEBUG on
+the schema is generated once per process instead, which the development
+server restarts on every code change, so the docs follow the code without
+a rebuild. A stored schema that no longer matches is logged as stale.
+"""
+import gzip
+import hashlib
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views import View
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from .http import accepts_encoding
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMATS = {
+    'yaml': ('openapi.yaml', 'application/vnd.oai.openapi'),
+    'json': ('openapi.json', 'application/vnd.oai.openapi+json'),
+}
+
+
+class SchemaArtifact:
+    """One rendered schema file with its gzip copy and ETag."""
+
+    def __init__(self, content, gzipped=None, etag=None):
+        self.content = content
+        self.gzipped = gzipped if gzipped is not None else gzip.compress(content, mtime=0)
+        self.etag = etag or '"{}"'.format(hashlib.sha256(content).hexdigest()[:32])
+
+    @property
+    def gzip_etag(self):
+        return f'{self.etag[:-1]}-gzip"'
+
+
+def generate_schema():
+    """Render the schema of the sync URL configuration in every format."""
+    # The ASGI URL configuration contains plain Django views the generator
+    # cannot describe; the API itself is the same.
+    generator = SchemaGenerator(urlconf='nptel.urls')
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        'yaml': SchemaArtifact(OpenApiYamlRenderer().render(schema, renderer_context={})),
+        'json': SchemaArtifact(OpenApiJsonRenderer().render(schema, renderer_context={})),
+    }
+
+
+def write_schema(artifacts, directory=None):
+    """Store the artifacts in `directory` and return the written paths."""
+    directory = Path(directory or settings.SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for schema_format, artifact in artifacts.items():
+        path = directory / SCHEMA_FORMATS[schema_format][0]
+        path.write_bytes(artifact.content)
+        path.with_name(path.name + '.gz').write_bytes(artifact.gzipped)
+        path.with_name(path.name + '.etag').write_text(artifact.etag)
+        paths += [path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.etag')]
+    return paths
+
+
+_loaded = {}
+_generated = None
+
+
+def load_schema(directory):
+    """
+    Read the stored artifacts once per process, or return None while they are
+    missing. A miss is not remembered, a later build_schema is picked up.
+    """
+    if directory not in _loaded:
+        artifacts = _read_schema(directory)
+        if artifacts is None:
+            return None
+        _loaded[directory] = artifacts
+    return _loaded[directory]
+
+
+def debug_schema(directory):
+    """
+    Generate the schema once per process and warn when the artifacts stored
+    in `directory` differ from it.
+    """
+    global _generated
+    if _generated is None:
+        _generated = generate_schema()
+        stored = _read_schema(directory)
+        if stored is not None and any(stored[name].etag != artifact.etag for name, artifact in _generated.items()):
+            logger.warning("The stored API schema in %s is out of date, run manage.py build_schema.", directory)
+    return _generated
+
+
+def _read_schema(directory):
+    artifacts = {}
+    for schema_format, (filename, _) in SCHEMA_FORMATS.items():
+        path = Path(directory) / filename
+        try:
+            artifacts[schema_format] = SchemaArtifact(
+                path.read_bytes(),
+                path.with_name(filename + '.gz').read_bytes(),
+                path.with_name(filename + '.etag').read_text().strip(),
+            )
+        except FileNotFoundError:
+            return None
+    return artifacts
+
+
+class StoredSchemaView(View):
+    """
+    OpenAPI schema. YAML by default, JSON for `?format=json` or an Accept
+    header asking for JSON.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if settings.DEBUG:
+            artifacts = debug_schema(str(settings.SCHEMA_DIR))
+        else:
+            artifacts = load_schema(str(settings.SCHEMA_DIR))
+        if artifacts is None:
+            return JsonResponse(
+                {'detail': 'The API schema has not been built, run manage.py build_schema.'}, status=503
+            )
+
+        schema_format = 'yaml'
+        if request.GET.get('format') == 'json' or 'json' in request.headers.get('Accept', ''):
+            schema_format = 'json'
+        artifact = artifacts[schema_format]
+        filename, content_type = SCHEMA_FORMATS[schema_format]
+
+        use_gzip = accepts_encoding(request, 'gzip')
+        etag = artifact.gzip_etag if use_gzip else artifact.etag
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(artifact.gzipped if use_gzip else artifact.content, content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{spectacular_settings.TITLE or "schema"}.{schema_format}"'
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=300'
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
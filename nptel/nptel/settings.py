@@ -11,8 +11,9 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
 
 SECRET_KEY = "django-insecure-z6(gj(g4!f(@5bejr_ut=1cq^)o7)ah=g%@$y*ro)j51$!k-x6"
-DEBUG = True
-ALLOWED_HOSTS = []
+DEBUG = os.environ.get("DEBUG", "true").lower() in ("1", "true", "yes")
+# Comma separated, required once DEBUG is off.
+ALLOWED_HOSTS = [host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host]
 
 
 # Application definition
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # External packages
     "rest_framework",
     "rest_framework_simplejwt",
@@ -34,6 +36,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "nptel.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -42,9 +45,10 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "nptel.middleware.ReplicaMiddleware",
 ]
 
-ROOT_URLCONF = "nptel.urls"
+ROOT_URLCONF = os.environ.get("ROOT_URLCONF", "nptel.urls")
 
 TEMPLATES = [
     {
@@ -65,6 +69,15 @@ WSGI_APPLICATION = "nptel.wsgi.application"
 
 
 # Database
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request) and checked before reuse when DB_CONN_HEALTH_CHECKS is on.
+# With DB_POOL on, PostgreSQL connections come from a psycopg 3 pool of
+# DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections per process instead; a
+# request waits at most DB_POOL_TIMEOUT seconds for one. The ASGI deployment
+# should use the pool, persistent connections are not reused there. Pool
+# statistics: nptel/db.py.
+DB_POOL = os.environ.get("DB_POOL", "false").lower() in ("1", "true", "yes")
+
 DATABASES = {
     "default": {
         "ENGINE": os.environ.get('DB_ENGINE'),
@@ -73,9 +86,60 @@ DATABASES = {
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
         "PORT": os.environ.get("DB_PORT"),
+        # Django does not allow persistent connections together with a pool.
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower() in ("1", "true", "yes"),
     }
 }
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
+    }
 
+# Read replicas. DB_REPLICA_HOSTS is a comma separated list of host[:port],
+# DB_REPLICA_NAMES optionally the database name of each replica (for SQLite,
+# the file of a copy). Missing values are taken from the primary. They become
+# the aliases replica1, replica2, ... that the catalog and listing views read
+# from, see nptel/routers.py. After a write a client reads from the primary
+# for DB_REPLICA_PIN_SECONDS.
+_replica_hosts = [host for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host]
+_replica_names = [name for name in os.environ.get("DB_REPLICA_NAMES", "").split(",") if name]
+DATABASE_REPLICAS = []
+for _index in range(max(len(_replica_hosts), len(_replica_names))):
+    _host, _, _port = (_replica_hosts[_index] if _index < len(_replica_hosts) else "").partition(":")
+    DATABASES[f"replica{_index + 1}"] = {
+        **DATABASES["default"],
+        "HOST": _host or DATABASES["default"]["HOST"],
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "NAME": _replica_names[_index] if _index < len(_replica_names) else DATABASES["default"]["NAME"],
+        "OPTIONS": dict(DATABASES["default"].get("OPTIONS", {})),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index + 1}")
+
+DATABASE_ROUTERS = ["nptel.routers.ReplicaRouter"]
+DB_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", 10))
+
+
+# Cache
+# Any Django cache backend works here, e.g. locmem, file based or
+# django.core.cache.backends.redis.RedisCache with a redis:// location.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+# Seconds a cached catalog page or course payload stays valid. Entries are
+# also invalidated whenever a course changes, course payloads and statistics
+# whenever one of their registrations changes. The registration counters on
+# catalog pages can lag by this long, see course/cache.py.
+COURSE_CACHE_TIMEOUT = int(os.environ.get("COURSE_CACHE_TIMEOUT", 300))
 
 
 # Password validation
@@ -94,6 +158,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher is used for new passwords. Stored hashes with a different
+# algorithm or iteration count are upgraded on the next successful login.
+PASSWORD_HASHERS = [
+    "user.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", 1_000_000))
+
+# Login password checks run in a pool of PASSWORD_HASHER_WORKERS threads. At
+# most PASSWORD_HASHER_MAX_LOGINS logins per process may be in progress, a
+# login beyond that is answered with 503 at once. The default is one less than
+# the request threads of a gunicorn worker, so other requests always get one.
+PASSWORD_HASHER_WORKERS = int(os.environ.get("PASSWORD_HASHER_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASHER_MAX_LOGINS = int(os.environ.get(
+    "PASSWORD_HASHER_MAX_LOGINS", max(1, int(os.environ.get("GUNICORN_THREADS", 4)) - 1)
+))
+
+# Bulk account import, see user/importer.py. Passwords are hashed in
+# ACCOUNT_IMPORT_WORKERS processes, rows are inserted in batches.
+ACCOUNT_IMPORT_WORKERS = int(os.environ.get("ACCOUNT_IMPORT_WORKERS", os.cpu_count() or 1))
+ACCOUNT_IMPORT_BATCH_SIZE = int(os.environ.get("ACCOUNT_IMPORT_BATCH_SIZE", 1000))
+# Largest file the import endpoint accepts. The import runs inside the
+# request, bigger files go through the import_accounts command.
+ACCOUNT_IMPORT_MAX_UPLOAD_SIZE = int(os.environ.get("ACCOUNT_IMPORT_MAX_UPLOAD_SIZE", 1024 * 1024))
+
 
 # Internationalization
 LANGUAGE_CODE = "en-us"
@@ -116,8 +208,13 @@ AUTH_USER_MODEL = "user.User"
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=10),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
+    # Refreshing checks that the account is still active, see user/serializers.py.
+    'TOKEN_REFRESH_SERIALIZER': 'user.serializers.RefreshSerializer',
 }
 
+# Seconds before stateless authentication reloads the list of deactivated users.
+JWT_REVOCATION_CACHE_TTL = int(os.environ.get("JWT_REVOCATION_CACHE_TTL", 30))
+
 #TODO: Modify
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -126,8 +223,10 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ),
     
+    # Read-only requests are authenticated from the token claims alone, writes
+    # still load the user row. See user/authentication.py.
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user.authentication.StatelessReadJWTAuthentication',
     ),
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -135,6 +234,39 @@ REST_FRAMEWORK = {
 }
 
 
+# Request instrumentation, see nptel/middleware.py. REQUEST_SAMPLE_RATE is
+# the share of requests whose queries are recorded and logged. Requests
+# slower than SLOW_REQUEST_MS milliseconds and requests that run one statement
+# DUPLICATE_QUERY_THRESHOLD times or more are logged as warnings. The
+# Server-Timing header exposes timings to any client, so it is opt-in.
+REQUEST_SAMPLE_RATE = float(os.environ.get("REQUEST_SAMPLE_RATE", 0.01))
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 500))
+DUPLICATE_QUERY_THRESHOLD = int(os.environ.get("DUPLICATE_QUERY_THRESHOLD", 3))
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "nptel.log.JsonFormatter"},
+    },
+    "handlers": {
+        "json": {"class": "logging.StreamHandler", "formatter": "json"},
+    },
+    "loggers": {
+        "nptel.requests": {
+            "handlers": ["json"],
+            "level": os.environ.get("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+
+# Output of `manage.py build_schema`, served at api/schema/. With DEBUG on and
+# no stored schema, it is generated per request.
+SCHEMA_DIR = Path(os.environ.get("SCHEMA_DIR", BASE_DIR / "schema"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "NPTEL",
     "DESCRIPTION": "NPTEL API Documentation",
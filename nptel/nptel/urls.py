@@ -4,15 +4,18 @@ URL configuration for nptel project.
 
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView, SpectacularAPIView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 from django.conf import settings
 from django.conf.urls.static import static
+from .db import DatabaseStatsView
+from .schema import StoredSchemaView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('course/', include('course.urls')),
     path('user/', include('user.urls')),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", StoredSchemaView.as_view(), name="schema"),
+    path("api/db/stats/", DatabaseStatsView.as_view(), name="database-stats"),
     path('api/docs', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     path('', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
@@ -0,0 +1,164 @@
+"""
+JWT authentication without a per-request user lookup.
+
+`StatelessJWTAuthentication` builds the user from the token claims instead
+of loading the User row. Deactivated accounts are still rejected through an
+in-process revocation list that is refreshed in bulk every
+`JWT_REVOCATION_CACHE_TTL` seconds, and deleted accounts through an
+existence check that runs once per user in that period. Refreshing a token also checks the
+account, see `RefreshSerializer` in user/serializers.py.
+
+`StatelessReadJWTAuthentication` only does that for safe (read-only) HTTP
+methods and falls back to the regular database check for writes. Views that
+always need a fresh user row can set
+`authentication_classes = [JWTAuthentication]`.
+
+`aauthenticate` does the same stateless check for plain Django async views.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from token claims. Any claim, e.g. `account_type`, can be read
+    as an attribute.
+    """
+    is_active = True
+
+
+class RevocationCache:
+    """
+    Set of deactivated user ids, reloaded with a single query once the TTL
+    has passed.
+
+    Only accounts modified within the access token lifetime are loaded: an
+    account deactivated before that cannot hold a valid access token.
+    Deleted accounts leave no row to load, so a user that is not revoked is
+    checked for existence the first time it is seen after each reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = frozenset()
+        self._existing = frozenset()
+        self._expires_at = 0.0
+
+    def refresh(self):
+        since = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        revoked = frozenset(
+            User.objects.filter(is_active=False, modified_at__gte=since).values_list('pk', flat=True)
+        )
+        with self._lock:
+            self._revoked = revoked
+            self._existing = frozenset()
+            self._expires_at = time.monotonic() + settings.JWT_REVOCATION_CACHE_TTL
+
+    async def arefresh(self):
+        since = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        revoked = frozenset([
+            pk async for pk in User.objects.filter(is_active=False, modified_at__gte=since).values_list('pk', flat=True)
+        ])
+        with self._lock:
+            self._revoked = revoked
+            self._existing = frozenset()
+            self._expires_at = time.monotonic() + settings.JWT_REVOCATION_CACHE_TTL
+
+    def revoke(self, user_id):
+        """Revoke a user in this process right away, without waiting for a refresh."""
+        with self._lock:
+            self._revoked = self._revoked | {user_id}
+            self._existing = self._existing - {user_id}
+
+    def confirm(self, user_id, exists):
+        """Record the result of an existence check until the next refresh."""
+        if not exists:
+            self.revoke(user_id)
+            return
+        with self._lock:
+            self._existing = self._existing | {user_id}
+
+    def clear(self):
+        with self._lock:
+            self._revoked = frozenset()
+            self._existing = frozenset()
+            self._expires_at = 0.0
+
+    def is_revoked(self, user_id):
+        if time.monotonic() >= self._expires_at:
+            self.refresh()
+        if user_id not in self._revoked and user_id not in self._existing:
+            self.confirm(user_id, User.objects.filter(pk=user_id).exists())
+        return user_id in self._revoked
+
+    async def ais_revoked(self, user_id):
+        if time.monotonic() >= self._expires_at:
+            await self.arefresh()
+        if user_id not in self._revoked and user_id not in self._existing:
+            self.confirm(user_id, await User.objects.filter(pk=user_id).aexists())
+        return user_id in self._revoked
+
+
+revocation_cache = RevocationCache()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Authenticate from the token claims without querying the User table."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        if revocation_cache.is_revoked(user_id):
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return ClaimsUser(validated_token)
+
+
+class StatelessReadJWTAuthentication(StatelessJWTAuthentication):
+    """Stateless for read-only requests, a fresh database check for writes."""
+
+    def authenticate(self, request):
+        self.fresh = request.method not in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.fresh:
+            return JWTAuthentication.get_user(self, validated_token)
+        return super().get_user(validated_token)
+
+
+async def aauthenticate(request):
+    """
+    Authenticate a Django request from its bearer token claims.
+
+    Returns a (ClaimsUser, token) pair, or None without credentials. Raises
+    the same exceptions as StatelessJWTAuthentication for bad tokens.
+    """
+    authentication = StatelessJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    token = authentication.get_validated_token(raw_token)
+    try:
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken("Token contained no recognizable user identification")
+    if await revocation_cache.ais_revoked(user_id):
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return ClaimsUser(token), token
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from `PASSWORD_HASH_ITERATIONS`.
+
+    Hashes are stored under the standard `pbkdf2_sha256` algorithm name, so
+    existing passwords keep working and are rehashed with the configured
+    iteration count on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+def encode_password(password, iterations):
+    """
+    Hash `password` with PBKDF2-SHA256 and an explicit iteration count.
+
+    Only needs the standard library and Django's hasher class, not configured
+    settings, so it can run in worker processes started with `spawn`.
+    """
+    hasher = hashers.PBKDF2PasswordHasher()
+    return hasher.encode(password, hasher.salt(), iterations)
@@ -0,0 +1,112 @@
+"""
+Sequential, collision-free identifiers for students, faculty and courses.
+
+Numbers are allocated in blocks of any size with a single round trip, so
+bulk inserts get all their identifiers at once:
+
+    student_ids = new_identifiers('student', 500)
+
+On PostgreSQL every identifier has its own database sequence (created in
+user migration 0005). `nextval` is never rolled back, so two transactions
+can never receive the same number, and the sequence `CACHE` lets each
+connection reserve a block of numbers in memory. Other databases increment
+a row of the `IdentifierSequence` table in one statement: SQLite (3.35 or
+newer) with `UPDATE ... RETURNING`, MySQL and MariaDB, which have no
+RETURNING for updates, with `LAST_INSERT_ID(expr)`. The increment is part
+of the caller's transaction and holds the row lock until it ends.
+
+Gaps in the numbering are expected and harmless.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import IdentifierSequence
+
+
+IDENTIFIER_FORMATS = {
+    'student': 'STU{}',
+    'faculty': 'FAC{}',
+    'course': 'COURSE-{:08X}',
+}
+
+
+def sequence_name(name):
+    """Name of the PostgreSQL sequence backing identifier `name`."""
+    return f'identifier_{name}_seq'
+
+
+def allocate(name, count=1, using=DEFAULT_DB_ALIAS):
+    """Reserve `count` unused numbers of sequence `name` and return them."""
+    if name not in IDENTIFIER_FORMATS:
+        raise KeyError(f"Unknown identifier {name!r}.")
+    if count < 1:
+        return []
+    vendor = connections[using].vendor
+    if vendor == 'postgresql':
+        return _allocate_postgresql(name, count, using)
+    if vendor == 'mysql':
+        return _allocate_mysql(name, count, using)
+    return _allocate_fallback(name, count, using)
+
+
+def _allocate_postgresql(name, count, using):
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [sequence_name(name), count])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _allocate_fallback(name, count, using):
+    connection = connections[using]
+    table = connection.ops.quote_name(IdentifierSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        # A single statement, so the increment and the read cannot interleave
+        # with another allocation even outside of a transaction.
+        cursor.execute(
+            f'UPDATE {table} SET next_value = next_value + %s WHERE name = %s RETURNING next_value',
+            [count, name],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        IdentifierSequence.objects.using(using).get_or_create(name=name)
+        return _allocate_fallback(name, count, using)
+    end = row[0]
+    return list(range(end - count, end))
+
+
+def _allocate_mysql(name, count, using):
+    connection = connections[using]
+    table = connection.ops.quote_name(IdentifierSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        # LAST_INSERT_ID(expr) stores the new value for this connection only,
+        # reading it back needs no second look at the table.
+        cursor.execute(
+            f'UPDATE {table} SET next_value = LAST_INSERT_ID(next_value + %s) WHERE name = %s',
+            [count, name],
+        )
+        if cursor.rowcount == 0:
+            IdentifierSequence.objects.using(using).get_or_create(name=name)
+            return _allocate_mysql(name, count, using)
+        cursor.execute('SELECT LAST_INSERT_ID()')
+        end = cursor.fetchone()[0]
+    return list(range(end - count, end))
+
+
+def new_identifiers(name, count, using=DEFAULT_DB_ALIAS):
+    """Return `count` new formatted identifiers, e.g. ['STU41', 'STU42']."""
+    template = IDENTIFIER_FORMATS[name]
+    return [template.format(number) for number in allocate(name, count, using=using)]
+
+
+def new_identifier(name, using=DEFAULT_DB_ALIAS):
+    """Return one new formatted identifier."""
+    return new_identifiers(name, 1, using=using)[0]
+
+
+def assign_identifiers(instances, name, field, using=DEFAULT_DB_ALIAS):
+    """
+    Fill `field` on every instance that has no identifier yet, with a single
+    allocation. Meant for objects passed to `bulk_create`, which skips the
+    pre_save signals that assign identifiers one at a time.
+    """
+    missing = [instance for instance in instances if not getattr(instance, field)]
+    for instance, identifier in zip(missing, new_identifiers(name, len(missing), using=using)):
+        setattr(instance, field, identifier)
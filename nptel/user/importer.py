@@ -0,0 +1,291 @@
+"""
+Bulk import of student and faculty accounts.
+
+Rows are read from a CSV or NDJSON stream and processed in batches:
+
+1. every row is validated and checked for duplicate usernames and emails,
+   within the file and against the database (two or three queries per batch),
+2. passwords are hashed in a pool of worker processes,
+3. users and profiles are inserted with one `bulk_create` each.
+
+While one batch is inserted the passwords of the next batch are already
+being hashed. The hashing processes are started once per process and
+reused by every import, see `hashing_pool`. The per-row `post_save`/`pre_save` signals of the user app are
+bypassed, so profiles and their student/faculty IDs are created here.
+
+Each row needs `username`, `password` and `account_type` (`student` or
+`faculty`). The remaining columns are the profile fields of that account
+type; empty values are ignored.
+"""
+import csv
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice, repeat
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .hashers import encode_password
+from .identifiers import assign_identifiers
+from .models import User, FacultyProfile, StudentProfile
+
+
+PROFILE_MODELS = {
+    'student': StudentProfile,
+    'faculty': FacultyProfile,
+}
+
+PROFILE_FIELDS = {
+    'student': ['first_name', 'last_name', 'email', 'phone_number', 'biography', 'preferred_language'],
+    'faculty': ['first_name', 'last_name', 'email', 'department', 'designation'],
+}
+
+# Profile field holding the generated ID.
+PROFILE_IDS = {
+    'student': 'student_id',
+    'faculty': 'faculty_id',
+}
+
+ACCOUNT_FIELDS = {'username', 'password', 'account_type'}
+
+FORMATS = ('csv', 'ndjson')
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hashing_pool():
+    """
+    Return the process-wide pool of ACCOUNT_IMPORT_WORKERS hashing processes,
+    starting it on first use. Starting the processes takes seconds, far longer
+    than hashing a small import.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Workers are spawned rather than forked: the importer also runs inside
+            # multi-threaded web workers, and hashing needs no inherited state.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.ACCOUNT_IMPORT_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def read_rows(stream, file_format):
+    """
+    Yield (line number, row, error) for every record of `stream`. `row` is a
+    dict, or None when the record could not be parsed.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "Row has more values than the header has columns."
+            else:
+                yield reader.line_num, row, None
+    elif file_format == 'ndjson':
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as exc:
+                yield line, None, f"Invalid JSON: {exc}"
+                continue
+            if isinstance(row, dict):
+                yield line, row, None
+            else:
+                yield line, None, "Expected a JSON object."
+    else:
+        raise ValueError(f"Unknown format {file_format!r}, expected one of {', '.join(FORMATS)}.")
+
+
+class AccountImporter:
+    """
+    Import accounts from `read_rows` records.
+
+        importer = AccountImporter(batch_size=1000)
+        summary = importer.run(read_rows(stream, 'csv'))
+
+    `hash_iterations` lowers the PBKDF2 cost of imported passwords. Such
+    hashes are upgraded to `PASSWORD_HASH_ITERATIONS` on the first login.
+    With `dry_run`, rows are only validated.
+    """
+
+    def __init__(self, batch_size=None, workers=None, hash_iterations=None, dry_run=False):
+        self.batch_size = batch_size or settings.ACCOUNT_IMPORT_BATCH_SIZE
+        self.workers = workers or settings.ACCOUNT_IMPORT_WORKERS
+        self.hash_iterations = hash_iterations or settings.PASSWORD_HASH_ITERATIONS
+        self.dry_run = dry_run
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        self.rows = 0
+        self.created = {account_type: 0 for account_type in PROFILE_MODELS}
+        self.errors = []
+
+    def run(self, records):
+        """Import every record and return a summary of the import."""
+        records = iter(records)
+        if self.workers == settings.ACCOUNT_IMPORT_WORKERS:
+            pool_context = nullcontext(hashing_pool())
+        else:
+            pool_context = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        with pool_context as pool:
+            pending = None
+            while batch := list(islice(records, self.batch_size)):
+                accounts = self.prepare(batch)
+                hashes = None
+                if accounts and not self.dry_run:
+                    hashes = pool.map(
+                        encode_password,
+                        [account['password'] for account in accounts],
+                        repeat(self.hash_iterations),
+                        chunksize=max(1, len(accounts) // (self.workers * 4)),
+                    )
+                if pending:
+                    self.insert(*pending)
+                pending = (accounts, hashes) if hashes else None
+            if pending:
+                self.insert(*pending)
+        return self.summary()
+
+    def summary(self):
+        created = sum(self.created.values())
+        return {
+            'rows': self.rows,
+            'created': created,
+            'created_students': self.created['student'],
+            'created_faculty': self.created['faculty'],
+            'failed': len(self.errors),
+            'dry_run': self.dry_run,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+        }
+
+    def fail(self, line, username, errors):
+        self.errors.append({'line': line, 'username': username, 'errors': errors})
+
+    def prepare(self, batch):
+        """Validate a batch and return the accounts that can be created."""
+        accounts = []
+        for line, row, error in batch:
+            self.rows += 1
+            if error:
+                self.fail(line, None, {'non_field_errors': [error]})
+                continue
+            account = self.clean(line, row)
+            if account is not None:
+                accounts.append(account)
+
+        usernames = {account['username'] for account in accounts}
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set()
+        for account_type, model in PROFILE_MODELS.items():
+            emails = {
+                account['profile'].email for account in accounts
+                if account['account_type'] == account_type and account['profile'].email
+            }
+            if emails:
+                taken_emails.update(
+                    (account_type, email)
+                    for email in model.objects.filter(email__in=emails).values_list('email', flat=True)
+                )
+
+        valid = []
+        for account in accounts:
+            email = (account['account_type'], account['profile'].email)
+            if account['username'] in taken_usernames:
+                self.fail(account['line'], account['username'], {'username': ["An account with this username already exists."]})
+            elif email in taken_emails:
+                self.fail(account['line'], account['username'], {'email': ["A profile with this email already exists."]})
+            else:
+                valid.append(account)
+        return valid
+
+    def clean(self, line, row):
+        """Validate one row. Return the account, or None after recording the errors."""
+        row = {key: value.strip() if isinstance(value, str) else value for key, value in row.items() if key}
+        username = row.get('username') or None
+        account_type = row.get('account_type') or None
+        errors = {}
+
+        if not username:
+            errors['username'] = ["This field is required."]
+        elif not isinstance(username, str) or len(username) > User._meta.get_field('username').max_length:
+            errors['username'] = ["Enter a valid username of at most 255 characters."]
+        elif username in self.seen_usernames:
+            errors['username'] = ["Duplicate username in the import file."]
+        if not row.get('password') or not isinstance(row['password'], str):
+            errors['password'] = ["This field is required."]
+        if account_type not in PROFILE_MODELS:
+            errors['account_type'] = [f"Expected one of {', '.join(PROFILE_MODELS)}."]
+            self.fail(line, username, errors)
+            return None
+
+        fields = PROFILE_FIELDS[account_type]
+        unknown = sorted(key for key, value in row.items() if key not in ACCOUNT_FIELDS and key not in fields and value not in ('', None))
+        for key in unknown:
+            errors[key] = [f"Not a {account_type} field."]
+
+        profile = PROFILE_MODELS[account_type](**{
+            field: row[field] for field in fields if row.get(field) not in ('', None)
+        })
+        try:
+            profile.full_clean(exclude=['user', PROFILE_IDS[account_type]], validate_unique=False)
+        except ValidationError as exc:
+            errors.update(exc.message_dict)
+
+        if profile.email and (account_type, profile.email) in self.seen_emails:
+            errors.setdefault('email', []).append("Duplicate email in the import file.")
+
+        if errors:
+            self.fail(line, username, errors)
+            return None
+
+        self.seen_usernames.add(username)
+        if profile.email:
+            self.seen_emails.add((account_type, profile.email))
+        return {
+            'line': line,
+            'username': username,
+            'password': row['password'],
+            'account_type': account_type,
+            'profile': profile,
+        }
+
+    def insert(self, accounts, hashes):
+        """Create the users and profiles of a validated batch."""
+        users = [
+            User(username=account['username'], password=password, account_type=account['account_type'])
+            for account, password in zip(accounts, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                if any(user.pk is None for user in users):
+                    # Backends that cannot return primary keys from a bulk insert.
+                    ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))
+                    for user in users:
+                        user.pk = ids[user.username]
+
+                profiles = {account_type: [] for account_type in PROFILE_MODELS}
+                for account, user in zip(accounts, users):
+                    account['profile'].user = user
+                    profiles[account['account_type']].append(account['profile'])
+                for account_type, model in PROFILE_MODELS.items():
+                    assign_identifiers(profiles[account_type], account_type, PROFILE_IDS[account_type])
+                    model.objects.bulk_create(profiles[account_type])
+        except IntegrityError:
+            # Another request created one of these accounts after validation.
+            for account in accounts:
+                self.fail(account['line'], account['username'], {
+                    'non_field_errors': ["Conflicts with an account created during the import, retry this row."],
+                })
+            return
+
+        for account_type, created in profiles.items():
+            self.created[account_type] += len(created)
@@ -0,0 +1,94 @@
+"""
+Credential checks for the JWT login endpoints.
+
+Password hashing is deliberately slow, so it runs in a small, process-wide
+thread pool instead of directly on the request worker. A login holds one of
+`PASSWORD_HASHER_MAX_LOGINS` slots while it waits for the pool; when every
+slot is taken it is rejected with a 503 straight away. The default leaves at
+least one request thread of each worker free for the other endpoints during
+a login surge.
+
+Logins do not go through `django.contrib.auth.authenticate()`: only the
+password of the `User` row is checked, other authentication backends are
+not consulted. `user_login_failed` is sent for rejected credentials as
+`authenticate()` would. No session is created, so `user_logged_in` is not
+sent; the login views update `last_login` themselves when
+`SIMPLE_JWT['UPDATE_LAST_LOGIN']` is on.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+User = get_user_model()
+
+PROFILE_RELATIONS = {
+    'faculty': 'faculty_profile',
+    'student': 'student_profile',
+}
+
+
+class PasswordHasherBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many login attempts in progress, please try again shortly."
+    default_code = 'password_hasher_busy'
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHER_WORKERS, thread_name_prefix='password-hasher')
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASHER_MAX_LOGINS)
+
+
+@contextmanager
+def login_slot():
+    """Hold a login slot for the wrapped block, or raise PasswordHasherBusy."""
+    if not _slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+def run_hasher(func, *args):
+    """Run a hashing function in the pool and wait for its result."""
+    return _executor.submit(func, *args).result()
+
+
+def authenticate_account(username, password, account_type, request=None):
+    """
+    Return the active user with this username and password together with
+    its `account_type` profile, or (None, None).
+
+    The user and the profile are loaded with one query. A user without the
+    requested profile is returned with a None profile. Only the hashing runs
+    in the pool; the optional rehash is saved from the calling thread so the
+    pool threads never open database connections.
+    """
+    with login_slot():
+        user, profile = _check_credentials(username, password, PROFILE_RELATIONS[account_type])
+    if user is None:
+        user_login_failed.send(sender=__name__, credentials={'username': username}, request=request)
+    return user, profile
+
+
+def _check_credentials(username, password, relation):
+    user = User.objects.select_related(relation).filter(username=username).first()
+    if user is None:
+        # Hash anyway so unknown usernames take as long as wrong passwords.
+        run_hasher(make_password, password)
+        return None, None
+
+    is_correct, must_update = run_hasher(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None, None
+
+    if must_update:
+        user.password = run_hasher(make_password, password)
+        user.save(update_fields=['password'])
+    return user, getattr(user, relation, None)
@@ -0,0 +1,80 @@
+"""
+Django command to import student and faculty accounts from a file.
+"""
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.importer import FORMATS, AccountImporter, read_rows
+
+
+class Command(BaseCommand):
+    """Django command to bulk import accounts from CSV or NDJSON."""
+    help = (
+        "Create students and faculty from a CSV or NDJSON file (or - for stdin). Every record needs "
+        "username, password and account_type, plus optional profile fields."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, - reads from stdin.")
+        parser.add_argument('--format', dest='file_format', choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, help="Rows per insert, defaults to ACCOUNT_IMPORT_BATCH_SIZE.")
+        parser.add_argument('--workers', type=int, help="Hashing processes, defaults to ACCOUNT_IMPORT_WORKERS.")
+        parser.add_argument(
+            '--hash-iterations', type=int,
+            help="PBKDF2 iterations for imported passwords. Lower values import faster, "
+                 "the hashes are upgraded on first login.",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only validate the file.")
+        parser.add_argument('--errors', help="Write the per-row errors as NDJSON to this file.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path']
+        file_format = options['file_format']
+        if file_format is None:
+            if path.endswith('.csv'):
+                file_format = 'csv'
+            elif path.endswith(('.ndjson', '.jsonl')):
+                file_format = 'ndjson'
+            else:
+                raise CommandError("Cannot tell the format from the file name, pass --format.")
+
+        importer = AccountImporter(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            hash_iterations=options['hash_iterations'],
+            dry_run=options['dry_run'],
+        )
+        started = time.perf_counter()
+        try:
+            if path == '-':
+                summary = importer.run(read_rows(sys.stdin, file_format))
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    summary = importer.run(read_rows(stream, file_format))
+        except OSError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as stream:
+                for error in summary['errors']:
+                    stream.write(json.dumps(error) + '\n')
+        else:
+            for error in summary['errors'][:20]:
+                self.stdout.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+            if summary['failed'] > 20:
+                self.stdout.write(f"... {summary['failed'] - 20} more, use --errors to write all of them.")
+
+        rate = summary['created'] / elapsed * 60 if elapsed else 0
+        message = (
+            f"{summary['rows']} rows, {summary['created_students']} students and "
+            f"{summary['created_faculty']} faculty created, {summary['failed']} failed "
+            f"in {elapsed:.1f}s ({rate:.0f} accounts/min)."
+        )
+        if options['dry_run']:
+            message = f"Dry run: {summary['rows']} rows, {summary['failed']} invalid."
+        self.stdout.write(self.style.SUCCESS(message) if not summary['failed'] else self.style.WARNING(message))
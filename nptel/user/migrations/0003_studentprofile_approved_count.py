@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_alter_facultyprofile_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
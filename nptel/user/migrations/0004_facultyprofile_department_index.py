@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_studentprofile_approved_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='facultyprofile',
+            name='department',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-18 15:39
+
+from django.db import migrations, models
+
+
+# Numbers each connection reserves at once from a PostgreSQL sequence.
+SEQUENCE_CACHE = 20
+
+
+def highest_number(values, prefix, base=10):
+    """Largest number behind `prefix` among existing identifiers."""
+    highest = 0
+    for value in values:
+        if value and value.startswith(prefix):
+            try:
+                highest = max(highest, int(value[len(prefix):], base))
+            except ValueError:
+                pass
+    return highest
+
+
+def seed_sequence(apps, schema_editor, name, start):
+    """Start sequence `name` at `start`, above every identifier already in use."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE SEQUENCE IF NOT EXISTS identifier_{name}_seq START WITH {int(start)} CACHE {SEQUENCE_CACHE}'
+        )
+    else:
+        IdentifierSequence = apps.get_model('user', 'IdentifierSequence')
+        IdentifierSequence.objects.using(schema_editor.connection.alias).update_or_create(
+            name=name, defaults={'next_value': start}
+        )
+
+
+def drop_sequence(schema_editor, name):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS identifier_{name}_seq')
+
+
+def seed_profile_sequences(apps, schema_editor):
+    StudentProfile = apps.get_model('user', 'StudentProfile')
+    FacultyProfile = apps.get_model('user', 'FacultyProfile')
+    students = StudentProfile.objects.values_list('student_id', flat=True).iterator()
+    faculty = FacultyProfile.objects.values_list('faculty_id', flat=True).iterator()
+    seed_sequence(apps, schema_editor, 'student', highest_number(students, 'STU') + 1)
+    seed_sequence(apps, schema_editor, 'faculty', highest_number(faculty, 'FAC') + 1)
+
+
+def drop_profile_sequences(apps, schema_editor):
+    drop_sequence(schema_editor, 'student')
+    drop_sequence(schema_editor, 'faculty')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_facultyprofile_department_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentifierSequence',
+            fields=[
+                ('name', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('next_value', models.PositiveBigIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Identifier Sequence',
+                'verbose_name_plural': 'Identifier Sequences',
+            },
+        ),
+        migrations.RunPython(seed_profile_sequences, drop_profile_sequences),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user', '0005_identifiersequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['modified_at'], name='user_deactivated_idx'),
+        ),
+    ]
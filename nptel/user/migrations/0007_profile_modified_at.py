@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_user_deactivated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facultyprofile',
+            name='modified_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='modified_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -2,14 +2,54 @@ from django.db import models
 from django.conf import settings
 from django.db import models
 from django.core.validators import MinLengthValidator
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
 
+def full_name(first_name, last_name):
+    """Display name of a student or faculty profile."""
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    elif first_name:
+        return first_name
+    else:
+        return f"No name provided"
+
+
+class CounterFieldsMixin:
+    """
+    For models with counters that are only ever moved with F() updates.
+    Saving an existing row leaves `counter_fields` out, so the values loaded
+    with the instance cannot overwrite counts changed since then.
+    """
+    counter_fields = ()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred and field.name not in self.counter_fields
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
 #Models
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        # Bulk updates skip auto_now. Deactivations must still move
+        # modified_at, the revocation list in user/authentication.py only
+        # loads recently modified inactive accounts.
+        if 'is_active' in kwargs:
+            kwargs.setdefault('modified_at', timezone.now())
+        return super().update(**kwargs)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """Manager for users"""
 
     def create_user(self, username, password, **extra_fields):
@@ -56,6 +96,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Deactivated accounts, loaded by the JWT revocation list.
+            models.Index(fields=['modified_at'], condition=models.Q(is_active=False), name='user_deactivated_idx'),
+        ]
 
     def is_student(self):
         return self.account_type == 'student'
@@ -67,7 +111,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.username
     
 
-class StudentProfile(models.Model):
+class StudentProfile(CounterFieldsMixin, models.Model):
     """Student profile model."""
     USER_LANGUAGE_CHOICES = (
         ('english', 'English'),
@@ -82,18 +126,20 @@ class StudentProfile(models.Model):
     phone_number = models.CharField(max_length=15, blank=True, null=True, validators=[MinLengthValidator(10)],)
     biography = models.TextField(blank=True, null=True)
     preferred_language = models.CharField(max_length=10, choices=USER_LANGUAGE_CHOICES, default='english')
+    # Moves with every save, so registration listings that show the name
+    # revalidate; counter updates leave it alone.
+    modified_at = models.DateTimeField(auto_now=True)
+
+    # Number of approved registrations, maintained by course/counters.py
+    approved_count = models.PositiveIntegerField(default=0, editable=False)
+    counter_fields = ('approved_count',)
 
     class Meta:
         verbose_name = "Student Profile"
         verbose_name_plural = "Student Profiles"
 
     def get_full_name(self):
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        else:
-            return f"No name provided"
+        return full_name(self.first_name, self.last_name)
 
     def __str__(self):
         if self.first_name and self.last_name:
@@ -110,21 +156,17 @@ class FacultyProfile(models.Model):
     faculty_id = models.CharField(max_length=15, unique=True, blank=True, null=True)
     first_name = models.CharField(max_length=255, blank=True, null=True)
     last_name = models.CharField(max_length=255, blank=True, null=True)
-    department = models.CharField(max_length=255, blank=True, null=True)
+    department = models.CharField(max_length=255, blank=True, null=True, db_index=True)
     designation = models.CharField(max_length=255, blank=True, null=True)
     email = models.EmailField(unique=True, blank=True, null=True)
+    modified_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Faculty Profile"
         verbose_name_plural = "Faculty Profiles"
 
     def get_full_name(self):
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        else:
-            return f"No name provided"
+        return full_name(self.first_name, self.last_name)
 
     def __str__(self):
         if self.first_name and self.last_name and self.department: 
@@ -137,3 +179,19 @@ class FacultyProfile(models.Model):
             return f"No name provided"
 
 
+
+
+class IdentifierSequence(models.Model):
+    """
+    Next free number of an identifier sequence, used by user/identifiers.py
+    on databases without native sequences.
+    """
+    name = models.CharField(max_length=32, primary_key=True)
+    next_value = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "Identifier Sequence"
+        verbose_name_plural = "Identifier Sequences"
+
+    def __str__(self):
+        return f"{self.name} ({self.next_value})"
@@ -0,0 +1,78 @@
+from rest_framework import permissions
+
+from .models import FacultyProfile, StudentProfile
+
+
+PROFILE_MODELS = {
+    'faculty': FacultyProfile,
+    'student': StudentProfile,
+}
+
+
+def get_profile_id(request, account_type):
+    """
+    Return the primary key of the faculty or student profile of the
+    authenticated user, or None if the user has no such profile.
+
+    The `account_type` and `profile_id` token claims are used when present.
+    They are only trusted while they agree with the user row loaded by the
+    authentication class, so changing or deactivating an account takes
+    effect immediately. Tokens issued before the claims existed fall back to
+    a database lookup. The result is memoized on the request.
+    """
+    if not hasattr(request, '_profile_ids'):
+        request._profile_ids = {}
+    if account_type in request._profile_ids:
+        return request._profile_ids[account_type]
+
+    user = request.user
+    profile_id = None
+    if user and user.is_authenticated:
+        token = request.auth
+        claimed_type = token.get('account_type') if token is not None else None
+        claims_valid = claimed_type is not None and claimed_type == getattr(user, 'account_type', claimed_type)
+        if claims_valid:
+            profile_id = token.get('profile_id') if claimed_type == account_type else None
+        if profile_id is None and (not claims_valid or claimed_type == account_type):
+            profile_id = (
+                PROFILE_MODELS[account_type].objects
+                .filter(user_id=user.pk).values_list('pk', flat=True).first()
+            )
+
+    request._profile_ids[account_type] = profile_id
+    return profile_id
+
+
+async def aget_profile_id(user, token, account_type):
+    """
+    Async counterpart of `get_profile_id` for a user authenticated from the
+    token claims by `aauthenticate`, whose claims are always trusted.
+    """
+    claimed_type = token.get('account_type')
+    if claimed_type is not None:
+        if claimed_type != account_type:
+            return None
+        if token.get('profile_id') is not None:
+            return token['profile_id']
+    return await (
+        PROFILE_MODELS[account_type].objects
+        .filter(user_id=user.pk).values_list('pk', flat=True).afirst()
+    )
+
+
+def get_faculty_profile_id(request):
+    return get_profile_id(request, 'faculty')
+
+
+def get_student_profile_id(request):
+    return get_profile_id(request, 'student')
+
+
+class IsFaculty(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return get_faculty_profile_id(request) is not None
+
+
+class IsStudent(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return get_student_profile_id(request) is not None
@@ -0,0 +1,7 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """Document the stateless authentication classes as the same bearer JWT scheme."""
+    target_class = 'user.authentication.StatelessJWTAuthentication'
+    match_subclasses = True
@@ -1,8 +1,12 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.db import transaction
 from user.models import FacultyProfile, StudentProfile
 from django.contrib.auth import get_user_model
+from user.login import authenticate_account
+from user.authentication import revocation_cache
 
 User = get_user_model()
 
@@ -11,14 +15,14 @@ class FacultyLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        user = authenticate(**data)
-        if user and user.is_active:
-            try:
-                faculty = FacultyProfile.objects.get(user=user)
-                return {'user': user, 'faculty': faculty}
-            except FacultyProfile.DoesNotExist:
-                raise serializers.ValidationError("User is not a faculty.")
-        raise serializers.ValidationError("Invalid credentials.")
+        user, faculty = authenticate_account(
+            data['username'], data['password'], 'faculty', request=self.context.get('request')
+        )
+        if user is None:
+            raise serializers.ValidationError("Invalid credentials.")
+        if faculty is None:
+            raise serializers.ValidationError("User is not a faculty.")
+        return {'user': user, 'faculty': faculty}
     
 
 class StudentLoginSerializer(serializers.Serializer):
@@ -26,14 +30,27 @@ class StudentLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        user = authenticate(**data)
-        if user and user.is_active:
-            try:
-                student = StudentProfile.objects.get(user=user)
-                return {'user': user, 'student': student}
-            except StudentProfile.DoesNotExist:
-                raise serializers.ValidationError("User is not a student.")
-        raise serializers.ValidationError("Invalid credentials.")
+        user, student = authenticate_account(
+            data['username'], data['password'], 'student', request=self.context.get('request')
+        )
+        if user is None:
+            raise serializers.ValidationError("Invalid credentials.")
+        if student is None:
+            raise serializers.ValidationError("User is not a student.")
+        return {'user': user, 'student': student}
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    """
+    Only issues a new access token while the account exists and is active,
+    whether it was deactivated through save() or a bulk update.
+    """
+
+    def validate(self, attrs):
+        user_id = self.token_class(attrs['refresh']).payload.get(jwt_settings.USER_ID_CLAIM)
+        if revocation_cache.is_revoked(user_id) or not User.objects.filter(pk=user_id, is_active=True).exists():
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        return super().validate(attrs)
 
 
 class CreateStudentSerializer(serializers.ModelSerializer):
@@ -1,7 +1,7 @@
-import random
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import StudentProfile, FacultyProfile, User
+from .identifiers import new_identifier
 
 
 # Signals
@@ -17,21 +17,38 @@ def create_profile(sender, instance, created, **kwargs):
             FacultyProfile.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+def revoke_inactive_user(sender, instance, **kwargs):
+    """
+    Reject the tokens of a deactivated user in this process right away.
+    """
+    if not instance.is_active:
+        from .authentication import revocation_cache
+        revocation_cache.revoke(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    """
+    Reject the tokens of a deleted user in this process right away.
+    """
+    from .authentication import revocation_cache
+    revocation_cache.revoke(instance.pk)
+
+
 @receiver(pre_save, sender=StudentProfile)
-def assign_student_id(sender, instance, **kwargs):
+def assign_student_id(sender, instance, using, **kwargs):
     """
     Assign a student_id to StudentProfile object.
     """
-    if not instance.student_id and instance.user_id:
-        random_suffix = random.randint(1000, 9999)
-        instance.student_id = f"STU{instance.user.id}{random_suffix}"
+    if not instance.student_id:
+        instance.student_id = new_identifier('student', using=using)
 
 
 @receiver(pre_save, sender=FacultyProfile)
-def assign_faculty_id(sender, instance, **kwargs):
+def assign_faculty_id(sender, instance, using, **kwargs):
     """
     Assign a faculty_id to FacultyProfile object.
     """
-    if not instance.faculty_id and instance.user_id:
-        random_suffix = random.randint(1000, 9999)
-        instance.faculty_id = f"FAC{instance.user.id}{random_suffix}"
+    if not instance.faculty_id:
+        instance.faculty_id = new_identifier('faculty', using=using)
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def tokens_for_user(user, profile=None):
+    """
+    Issue a refresh/access token pair for `user`.
+
+    The account type and profile primary key are embedded as claims so that
+    permission checks and profile lookups do not need to query the database.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh['account_type'] = user.account_type
+    if profile is not None:
+        refresh['profile_id'] = profile.pk
+    return {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+    }
@@ -8,7 +8,10 @@ from . import views
 urlpatterns = [
     path('faculty/login/', views.FacultyLoginView.as_view(), name='faculty-login'),
     path('student/login/', views.StudentLoginView.as_view(), name='student-login'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
 
     path('student/register/', views.CreateStudentView.as_view(), name='student-register'),
     path('faculty/register/', views.CreateFacultyView.as_view(), name='faculty-register'),
+
+    path('import/', views.AccountImportView.as_view(), name='account-import'),
 ]
\ No newline at end of file
@@ -1,11 +1,16 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import login
+from rest_framework.parsers import MultiPartParser
+import io
+from django.contrib.auth.models import update_last_login
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from .serializers import FacultyLoginSerializer, StudentLoginSerializer, CreateStudentSerializer, CreateFacultySerializer
+from .tokens import tokens_for_user
+from .importer import AccountImporter, read_rows
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 class FacultyLoginView(APIView):
@@ -14,23 +19,20 @@ class FacultyLoginView(APIView):
     @extend_schema(
         request=FacultyLoginSerializer,
         summary="Faculty Login",
-        description="Authenticates faculty and returns JWT tokens."
+        description="Authenticates faculty and returns JWT tokens. No session is created."
     )
     def post(self, request):
         """
         Authenticates the faculty user and returns JWT tokens for access and refresh.
         """
-        serializer = FacultyLoginSerializer(data=request.data)
+        serializer = FacultyLoginSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            login(request, user)
-            refresh = RefreshToken.for_user(user)
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
             
             return Response({
-                'token': {
-                    'access': str(refresh.access_token),
-                    'refresh': str(refresh),
-                },
+                'token': tokens_for_user(user, serializer.validated_data['faculty']),
                 'user': {
                     'id': user.id,
                     'username': user.username,
@@ -45,23 +47,20 @@ class StudentLoginView(APIView):
     @extend_schema(
         request=StudentLoginSerializer,
         summary="Student Login",
-        description="Authenticates student and returns JWT tokens."
+        description="Authenticates student and returns JWT tokens. No session is created."
     )
     def post(self, request):
         """
         Authenticates the student user and returns JWT tokens for access and refresh.
         """
-        serializer = StudentLoginSerializer(data=request.data)
+        serializer = StudentLoginSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            login(request, user)
-            refresh = RefreshToken.for_user(user)
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
             
             return Response({
-                'token': {
-                    'access': str(refresh.access_token),
-                    'refresh': str(refresh),
-                },
+                'token': tokens_for_user(user, serializer.validated_data['student']),
                 'user': {
                     'id': user.id,
                     'username': user.username,
@@ -87,14 +86,10 @@ class CreateStudentView(APIView):
         if serializer.is_valid():
             try:
                 student = serializer.save()
-                refresh = RefreshToken.for_user(student.user)
                 
                 return Response({
                     'message': 'Student account created successfully',
-                    'token': {
-                        'access': str(refresh.access_token),
-                        'refresh': str(refresh),
-                    },
+                    'token': tokens_for_user(student.user, student),
                     'data': serializer.data
                 }, status=status.HTTP_201_CREATED)
             except Exception as e:
@@ -122,14 +117,10 @@ class CreateFacultyView(APIView):
         if serializer.is_valid():
             try:
                 faculty = serializer.save()
-                refresh = RefreshToken.for_user(faculty.user)
                 
                 return Response({
                     'message': 'Faculty account created successfully',
-                    'token': {
-                        'access': str(refresh.access_token),
-                        'refresh': str(refresh),
-                    },
+                    'token': tokens_for_user(faculty.user, faculty),
                     'data': serializer.data
                 }, status=status.HTTP_201_CREATED)
             except Exception as e:
@@ -137,4 +128,67 @@ class CreateFacultyView(APIView):
                     'error': str(e)
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AccountImportView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    @extend_schema(
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary'},
+                    'file_format': {'type': 'string', 'enum': ['csv', 'ndjson']},
+                    'dry_run': {'type': 'boolean'},
+                },
+                'required': ['file'],
+            },
+        },
+        summary="Import Accounts",
+        description=(
+            "Creates students and faculty from an uploaded CSV or NDJSON file. Every record needs "
+            "username, password and account_type. Valid rows are created, invalid rows are reported "
+            "with their line number. Files are limited to ACCOUNT_IMPORT_MAX_UPLOAD_SIZE bytes."
+        ),
+        responses={
+            201: OpenApiResponse(description="Import summary with the per-row errors"),
+            400: OpenApiResponse(description="No row could be imported"),
+            413: OpenApiResponse(description="The file is too large"),
+        },
+    )
+    def post(self, request):
+        """
+        Bulk creates student and faculty accounts from an uploaded file.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'No file was uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.size > settings.ACCOUNT_IMPORT_MAX_UPLOAD_SIZE:
+            return Response(
+                {'detail': f'The file is larger than {settings.ACCOUNT_IMPORT_MAX_UPLOAD_SIZE} bytes, use the import_accounts command.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        file_format = request.data.get('file_format')
+        if not file_format:
+            file_format = 'csv' if upload.name.endswith('.csv') else 'ndjson'
+        if file_format not in ('csv', 'ndjson'):
+            return Response({'detail': 'file_format must be csv or ndjson.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('true', '1')
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            summary = AccountImporter(dry_run=dry_run).run(read_rows(stream, file_format))
+        except UnicodeDecodeError:
+            return Response({'detail': 'The file must be UTF-8 encoded.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if summary['created']:
+            response_status = status.HTTP_201_CREATED
+        elif summary['failed']:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(summary, status=response_status)